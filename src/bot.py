@@ -3,25 +3,74 @@
 from __future__ import annotations
 
 import asyncio
-import re
+import time
 from datetime import datetime, timedelta, timezone
 import logging
 from typing import TYPE_CHECKING
 from zoneinfo import ZoneInfo
 
-from aiogram import Bot, Dispatcher, Router
+from aiogram import Bot, Dispatcher
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.exceptions import TelegramRetryAfter
 from aiogram.filters import Command
 from aiogram.types import Message
 
-from src.config import AppConfig, load_config
+from src.config import AppConfig, load_config_cached
 from src.providers.base import AuthStatus, Provider
 
 if TYPE_CHECKING:
     from src.scheduler import WakeupScheduler
 
 logger = logging.getLogger(__name__)
+_TX_QUEUE_SIZE = 256
+_TX_FLUSH_TIMEOUT_SECONDS = 5
 _ISRAEL_TZ = ZoneInfo("Asia/Jerusalem")
-_WAKE_TIME_RE = re.compile(r"^(?:[01]\d|2[0-3]):[0-5]\d$")
+_STATUS_ICONS = {
+    AuthStatus.OK: "OK",
+    AuthStatus.NOT_AUTHENTICATED: "NOT AUTH",
+    AuthStatus.EXPIRED: "EXPIRED",
+    AuthStatus.ERROR: "ERROR",
+}
+_COMMANDS_TEXT = (
+    "<b>Pobudka Commands</b>\n\n"
+    "/status - Show all provider auth status\n"
+    "/auth &lt;provider&gt; - Start device-code auth\n"
+    "/check_auth [provider] - Verify auth status\n"
+    "/schedule - Show scheduler state\n"
+    "/wake &lt;provider&gt; - Trigger immediate wake-up\n"
+    "/wake &lt;provider&gt; HH:MM - Schedule next wake in Israel time\n"
+    "/weeklywake &lt;provider&gt; DD.MM HH:MM - Schedule weekly wake in Israel time\n"
+    "  Example: /weeklywake codex 17.01 12:00\n"
+    "/menu - Show command menu\n"
+    "/help - Show command menu\n"
+    "/start - Show command menu"
+)
+
+
+def _parse_hh_mm(raw: str) -> tuple[int, int] | None:
+    """Parse a strict HH:MM string, returning None when it is malformed."""
+    if (
+        len(raw) != 5
+        or raw[2] != ":"
+        or not raw.isascii()
+        or not raw[:2].isdigit()
+        or not raw[3:].isdigit()
+    ):
+        return None
+    hour = int(raw[:2])
+    minute = int(raw[3:])
+    if hour >= 24 or minute >= 60:
+        return None
+    return hour, minute
+
+
+def _log_auth_task_error(task: asyncio.Task[bool]) -> None:
+    """Retrieve and log a failed auth task's exception so it is not lost."""
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.error("Device auth flow failed", exc_info=exc)
 
 
 class TelegramBot:
@@ -30,43 +79,112 @@ class TelegramBot:
     def __init__(self, config: AppConfig, providers: dict[str, Provider]) -> None:
         self._config = config
         self._providers = providers
-        self._bot = Bot(token=config.telegram.bot_token)
+        try:
+            self._chat_id: int | None = int(config.telegram.chat_id)
+        except ValueError:
+            logger.error(
+                "TELEGRAM_CHAT_ID must be an integer, got %r; all commands will be ignored",
+                config.telegram.chat_id,
+            )
+            self._chat_id = None
+        self._session = AiohttpSession()
+        self._bot = Bot(token=config.telegram.bot_token, session=self._session)
         self._dp = Dispatcher()
-        self._router = Router()
-        self._dp.include_router(self._router)
         self._pending_auth: dict[str, asyncio.Task[bool]] = {}
+        self._auth_cache: dict[str, tuple[float, AuthStatus]] = {}
+        self._tx_queue: asyncio.Queue[str] = asyncio.Queue(maxsize=_TX_QUEUE_SIZE)
+        self._tx_task: asyncio.Task[None] | None = None
         self._scheduler: WakeupScheduler | None = None
 
-        # Register handlers with access to self
         self._register_handlers()
 
     @property
     def bot(self) -> Bot:
         return self._bot
 
+    @property
+    def session(self) -> AiohttpSession:
+        """HTTP session shared by the bot and any HTTP-based providers."""
+        return self._session
+
     async def start(self) -> None:
         """Start polling for Telegram updates."""
         logger.info("Starting Telegram bot")
-        await self._dp.start_polling(self._bot)
+        self._ensure_tx_worker()
+        await self._dp.start_polling(
+            self._bot,
+            polling_timeout=self._config.telegram.poll_timeout,
+            handle_as_tasks=True,
+            tasks_concurrency_limit=self._config.telegram.poll_limit,
+        )
 
     async def stop(self) -> None:
-        """Stop the bot and cancel pending auth flows."""
+        """Stop the bot, flush queued messages and cancel pending auth flows."""
         for task in self._pending_auth.values():
             task.cancel()
         self._pending_auth.clear()
-        await self._bot.session.close()
+
+        if self._tx_task is not None:
+            try:
+                await asyncio.wait_for(
+                    self._tx_queue.join(),
+                    timeout=_TX_FLUSH_TIMEOUT_SECONDS,
+                )
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Dropping %d undelivered Telegram messages on shutdown",
+                    self._tx_queue.qsize(),
+                )
+            self._tx_task.cancel()
+            await asyncio.gather(self._tx_task, return_exceptions=True)
+            self._tx_task = None
+
+        await self._session.close()
 
     def set_scheduler(self, scheduler: "WakeupScheduler") -> None:
         """Attach the scheduler used by bot command handlers."""
         self._scheduler = scheduler
 
     async def send(self, text: str) -> None:
-        """Send a message to the configured chat."""
-        await self._bot.send_message(
-            chat_id=self._config.telegram.chat_id,
-            text=text,
-            parse_mode="HTML",
-        )
+        """Queue a message for the configured chat.
+
+        Delivery happens in a single background worker so bursts are sent in
+        order and Telegram rate limits do not block the caller.
+        """
+        self._ensure_tx_worker()
+        await self._tx_queue.put(text)
+
+    def _ensure_tx_worker(self) -> None:
+        if self._tx_task is None or self._tx_task.done():
+            self._tx_task = asyncio.create_task(self._tx_worker())
+
+    async def _tx_worker(self) -> None:
+        while True:
+            text = await self._tx_queue.get()
+            try:
+                await self._deliver(text)
+            finally:
+                self._tx_queue.task_done()
+
+    async def _deliver(self, text: str) -> None:
+        """Send one message, waiting out Telegram flood control if needed."""
+        while True:
+            try:
+                await self._bot.send_message(
+                    chat_id=self._config.telegram.chat_id,
+                    text=text,
+                    parse_mode="HTML",
+                )
+                return
+            except TelegramRetryAfter as exc:
+                logger.warning(
+                    "Telegram rate limit hit, retrying in %ss",
+                    exc.retry_after,
+                )
+                await asyncio.sleep(exc.retry_after)
+            except Exception:
+                logger.exception("Failed to send Telegram message")
+                return
 
     async def get_schedule_text(self) -> str:
         """Return scheduler status text for `/schedule`."""
@@ -76,6 +194,9 @@ class TelegramBot:
 
     async def run_manual_wake(self, provider_name: str) -> str:
         """Trigger a wake-up and return a status message for `/wake`."""
+        if provider_name not in self._providers:
+            logger.warning("Manual wake failed: unknown provider=%s", provider_name)
+            return f"Unknown provider: {provider_name}"
         if self._scheduler is None:
             return "Scheduler is not initialized yet."
 
@@ -114,14 +235,16 @@ class TelegramBot:
         time_text: str,
     ) -> str:
         """Schedule next wake-up at HH:MM Israel time."""
+        if provider_name not in self._providers:
+            return f"Unknown provider: {provider_name}"
         if self._scheduler is None:
             return "Scheduler is not initialized yet."
 
         try:
-            refreshed_config = load_config()
+            refreshed_config = load_config_cached()
         except RuntimeError as exc:
-            logger.exception("Failed to reload config for scheduled wake")
-            return f"Config reload failed: {exc}"
+            logger.exception("Failed to load config for scheduled wake")
+            return f"Config error: {exc}"
 
         provider_config = refreshed_config.providers.get(provider_name)
         if provider_config is None:
@@ -154,14 +277,16 @@ class TelegramBot:
         time_text: str,
     ) -> str:
         """Schedule next weekly wake-up at DD.MM HH:MM Israel time."""
+        if provider_name not in self._providers:
+            return f"Unknown provider: {provider_name}"
         if self._scheduler is None:
             return "Scheduler is not initialized yet."
 
         try:
-            refreshed_config = load_config()
+            refreshed_config = load_config_cached()
         except RuntimeError as exc:
-            logger.exception("Failed to reload config for scheduled weekly wake")
-            return f"Config reload failed: {exc}"
+            logger.exception("Failed to load config for scheduled weekly wake")
+            return f"Config error: {exc}"
 
         provider_config = refreshed_config.providers.get(provider_name)
         if provider_config is None:
@@ -210,13 +335,13 @@ class TelegramBot:
             raise ValueError("Month must be between 01 and 12")
 
         # Parse time (HH:MM)
-        time_raw = time_text.strip()
-        if not _WAKE_TIME_RE.fullmatch(time_raw):
+        parsed_time = _parse_hh_mm(time_text.strip())
+        if parsed_time is None:
             raise ValueError(
                 "Invalid time format. Use HH:MM, e.g. /weeklywake codex 17.01 12:00"
             )
 
-        hour, minute = (int(part) for part in time_raw.split(":"))
+        hour, minute = parsed_time
 
         # Build datetime in Israel timezone
         now_utc = datetime.now(timezone.utc)
@@ -244,15 +369,14 @@ class TelegramBot:
 
     def _next_israel_occurrence(self, time_text: str) -> tuple[datetime, bool]:
         """Return next occurrence of HH:MM in Israel timezone as UTC."""
-        raw = time_text.strip()
-        if not _WAKE_TIME_RE.fullmatch(raw):
+        parsed_time = _parse_hh_mm(time_text.strip())
+        if parsed_time is None:
             raise ValueError(
                 "Invalid time format. Use HH:MM in Israel time, e.g. /wake codex 12:00"
             )
 
-        hour, minute = (int(part) for part in raw.split(":"))
-        now_utc = datetime.now(timezone.utc)
-        now_il = now_utc.astimezone(_ISRAEL_TZ)
+        hour, minute = parsed_time
+        now_il = datetime.now(_ISRAEL_TZ)
         target_il = now_il.replace(hour=hour, minute=minute, second=0, microsecond=0)
         next_day = target_il <= now_il
         if next_day:
@@ -260,29 +384,50 @@ class TelegramBot:
         return target_il.astimezone(timezone.utc), next_day
 
     def _commands_text(self) -> str:
-        return (
-            "<b>Pobudka Commands</b>\n\n"
-            "/status - Show all provider auth status\n"
-            "/auth &lt;provider&gt; - Start device-code auth\n"
-            "/check_auth [provider] - Verify auth status\n"
-            "/schedule - Show scheduler state\n"
-            "/wake &lt;provider&gt; - Trigger immediate wake-up\n"
-            "/wake &lt;provider&gt; HH:MM - Schedule next wake in Israel time\n"
-            "/weeklywake &lt;provider&gt; DD.MM HH:MM - Schedule weekly wake in Israel time\n"
-            "  Example: /weeklywake codex 17.01 12:00\n"
-            "/menu - Show command menu\n"
-            "/help - Show command menu\n"
-            "/start - Show command menu"
-        )
+        return _COMMANDS_TEXT
 
     async def check_all_auth(self) -> dict[str, AuthStatus]:
-        """Check auth status for all providers and return results."""
+        """Check auth status for all providers concurrently and return results."""
+        names = list(self._providers)
+        statuses = await asyncio.gather(
+            *(
+                self._cached_check(name, provider)
+                for name, provider in self._providers.items()
+            ),
+            return_exceptions=True,
+        )
+
         results: dict[str, AuthStatus] = {}
-        for name, provider in self._providers.items():
-            status = await provider.check_auth()
+        for name, status in zip(names, statuses):
+            if isinstance(status, BaseException):
+                logger.error(
+                    "Auth check raised for provider=%s",
+                    name,
+                    exc_info=status,
+                )
+                status = AuthStatus.ERROR
             results[name] = status
         return results
 
+    async def _cached_check(self, name: str, provider: Provider) -> AuthStatus:
+        """Return a recent auth status for one provider, re-checking when stale.
+
+        Only OK results are cached: after a manual CLI login the user runs
+        /check_auth and must see the new status right away.
+        """
+        cached = self._auth_cache.get(name)
+        if cached is not None:
+            checked_at, status = cached
+            if time.monotonic() - checked_at < self._config.scheduler.auth_recheck_seconds:
+                return status
+
+        status = await provider.check_auth()
+        if status == AuthStatus.OK:
+            self._auth_cache[name] = (time.monotonic(), status)
+        else:
+            self._auth_cache.pop(name, None)
+        return status
+
     async def run_device_auth(self, provider_name: str) -> None:
         """Orchestrate device-code auth for a provider via Telegram."""
         provider = self._providers.get(provider_name)
@@ -310,17 +455,31 @@ class TelegramBot:
 
         # Wait for completion in the background
         async def _wait() -> bool:
-            success = await provider.wait_for_device_auth()
-            if success:
-                await self.send(f"{provider.name} authentication successful!")
-            else:
-                await self.send(
-                    f"{provider.name} authentication timed out or failed.\n"
-                    f"Use /auth {provider_name} to try again."
-                )
-            return success
-
-        self._pending_auth[provider_name] = asyncio.create_task(_wait())
+            try:
+                success = await provider.wait_for_device_auth()
+                if success:
+                    self._auth_cache.pop(provider_name, None)
+                    await self.send(f"{provider.name} authentication successful!")
+                else:
+                    await self.send(
+                        f"{provider.name} authentication timed out or failed.\n"
+                        f"Use /auth {provider_name} to try again."
+                    )
+                return success
+            finally:
+                # A newer /auth may already have replaced this task.
+                if self._pending_auth.get(provider_name) is asyncio.current_task():
+                    del self._pending_auth[provider_name]
+
+        task = asyncio.create_task(_wait())
+        task.add_done_callback(_log_auth_task_error)
+        self._pending_auth[provider_name] = task
+        if len(self._pending_auth) > len(self._providers):
+            logger.warning(
+                "Pending auth flows (%d) exceed provider count (%d)",
+                len(self._pending_auth),
+                len(self._providers),
+            )
 
     def _auth_fallback_message(self, provider_name: str, provider_label: str) -> str:
         """Build provider-specific fallback instructions."""
@@ -351,160 +510,147 @@ class TelegramBot:
             f"<code>/check_auth {provider_name}</code>"
         )
 
+    def _is_authorized(self, message: Message) -> bool:
+        """Return True when the message comes from the configured chat."""
+        return message.chat.id == self._chat_id
+
     def _register_handlers(self) -> None:
         """Register Telegram command handlers."""
-        bot_ref = self
-
-        @self._router.message(Command("status"))
-        async def cmd_status(message: Message) -> None:
-            if str(message.chat.id) != bot_ref._config.telegram.chat_id:
-                return
-            results = await bot_ref.check_all_auth()
-            lines = ["<b>Provider Status</b>\n"]
-            for name, status in results.items():
-                icon = {
-                    AuthStatus.OK: "OK",
-                    AuthStatus.NOT_AUTHENTICATED: "NOT AUTH",
-                    AuthStatus.EXPIRED: "EXPIRED",
-                    AuthStatus.ERROR: "ERROR",
-                }[status]
-                lines.append(f"  {name}: {icon}")
-            await message.reply("\n".join(lines), parse_mode="HTML")
-
-        @self._router.message(Command("auth"))
-        async def cmd_auth(message: Message) -> None:
-            if str(message.chat.id) != bot_ref._config.telegram.chat_id:
-                return
-            parts = (message.text or "").split()
-            if len(parts) < 2:
-                names = ", ".join(bot_ref._providers.keys())
-                await message.reply(f"Usage: /auth <provider>\nAvailable: {names}")
-                return
-            provider_name = parts[1].lower()
-            await bot_ref.run_device_auth(provider_name)
+        self._dp.message.register(self._cmd_status, Command("status"))
+        self._dp.message.register(self._cmd_auth, Command("auth"))
+        self._dp.message.register(self._cmd_check_auth, Command("check_auth"))
+        self._dp.message.register(
+            self._cmd_menu,
+            Command("start", "help", "menu"),
+        )
+        self._dp.message.register(self._cmd_schedule, Command("schedule"))
+        self._dp.message.register(self._cmd_wake, Command("wake"))
+        self._dp.message.register(self._cmd_weeklywake, Command("weeklywake"))
 
-        @self._router.message(Command("check_auth"))
-        async def cmd_check_auth(message: Message) -> None:
-            if str(message.chat.id) != bot_ref._config.telegram.chat_id:
-                return
-            parts = (message.text or "").split()
-            if len(parts) < 2:
-                # Check all
-                results = await bot_ref.check_all_auth()
-                lines = []
-                for name, status in results.items():
-                    lines.append(f"{name}: {status.name}")
-                await message.reply("\n".join(lines))
-                return
+    async def _cmd_status(self, message: Message) -> None:
+        if not self._is_authorized(message):
+            return
+        results = await self.check_all_auth()
+        body = "\n".join(
+            f"  {name}: {_STATUS_ICONS[status]}" for name, status in results.items()
+        )
+        await message.reply(f"<b>Provider Status</b>\n\n{body}", parse_mode="HTML")
 
-            provider_name = parts[1].lower()
-            provider = bot_ref._providers.get(provider_name)
-            if provider is None:
-                await message.reply(f"Unknown provider: {provider_name}")
-                return
+    async def _cmd_auth(self, message: Message) -> None:
+        if not self._is_authorized(message):
+            return
+        parts = (message.text or "").split(maxsplit=2)
+        if len(parts) < 2:
+            names = ", ".join(self._providers.keys())
+            await message.reply(f"Usage: /auth <provider>\nAvailable: {names}")
+            return
+        provider_name = parts[1].lower()
+        await self.run_device_auth(provider_name)
 
-            status = await provider.check_auth()
-            await message.reply(f"{provider.name}: {status.name}")
+    async def _cmd_check_auth(self, message: Message) -> None:
+        if not self._is_authorized(message):
+            return
+        parts = (message.text or "").split(maxsplit=2)
+        if len(parts) < 2:
+            # Check all
+            results = await self.check_all_auth()
+            await message.reply(
+                "\n".join(f"{name}: {status.name}" for name, status in results.items())
+            )
+            return
 
-        @self._router.message(Command("help"))
-        async def cmd_help(message: Message) -> None:
-            if str(message.chat.id) != bot_ref._config.telegram.chat_id:
-                return
-            await message.reply(bot_ref._commands_text(), parse_mode="HTML")
+        provider_name = parts[1].lower()
+        provider = self._providers.get(provider_name)
+        if provider is None:
+            await message.reply(f"Unknown provider: {provider_name}")
+            return
 
-        @self._router.message(Command("menu"))
-        async def cmd_menu(message: Message) -> None:
-            if str(message.chat.id) != bot_ref._config.telegram.chat_id:
-                return
-            await message.reply(bot_ref._commands_text(), parse_mode="HTML")
+        status = await self._cached_check(provider_name, provider)
+        await message.reply(f"{provider.name}: {status.name}")
 
-        @self._router.message(Command("start"))
-        async def cmd_start(message: Message) -> None:
-            if str(message.chat.id) != bot_ref._config.telegram.chat_id:
-                return
-            await message.reply(bot_ref._commands_text(), parse_mode="HTML")
+    async def _cmd_menu(self, message: Message) -> None:
+        if not self._is_authorized(message):
+            return
+        await message.reply(self._commands_text(), parse_mode="HTML")
 
-        @self._router.message(Command("schedule"))
-        async def cmd_schedule(message: Message) -> None:
-            if str(message.chat.id) != bot_ref._config.telegram.chat_id:
-                return
-            await message.reply(await bot_ref.get_schedule_text(), parse_mode="HTML")
+    async def _cmd_schedule(self, message: Message) -> None:
+        if not self._is_authorized(message):
+            return
+        await message.reply(await self.get_schedule_text(), parse_mode="HTML")
 
-        @self._router.message(Command("wake"))
-        async def cmd_wake(message: Message) -> None:
-            logger.info(
-                "Received /wake command chat_id=%s text=%r",
+    async def _cmd_wake(self, message: Message) -> None:
+        logger.info(
+            "Received /wake command chat_id=%s text=%r",
+            message.chat.id,
+            message.text,
+        )
+        if not self._is_authorized(message):
+            logger.warning(
+                "Ignoring /wake from unauthorized chat_id=%s expected=%s",
                 message.chat.id,
-                message.text,
+                self._config.telegram.chat_id,
             )
-            if str(message.chat.id) != bot_ref._config.telegram.chat_id:
-                logger.warning(
-                    "Ignoring /wake from unauthorized chat_id=%s expected=%s",
-                    message.chat.id,
-                    bot_ref._config.telegram.chat_id,
-                )
-                return
-
-            parts = (message.text or "").split()
-            if len(parts) < 2:
-                names = ", ".join(bot_ref._providers.keys())
-                await message.reply(
-                    "Usage:\n"
-                    "/wake <provider>\n"
-                    "/wake <provider> HH:MM (Israel time)\n"
-                    f"Available: {names}"
-                )
-                return
-
-            provider_name = parts[1].lower()
-            if len(parts) == 2:
-                await message.reply(await bot_ref.run_manual_wake(provider_name))
-                return
-
-            if len(parts) == 3:
-                await message.reply(
-                    await bot_ref.schedule_wake_at_israel_time(provider_name, parts[2])
-                )
-                return
+            return
 
+        parts = (message.text or "").split(maxsplit=3)
+        if len(parts) < 2:
+            names = ", ".join(self._providers.keys())
             await message.reply(
                 "Usage:\n"
                 "/wake <provider>\n"
-                "/wake <provider> HH:MM (Israel time)"
+                "/wake <provider> HH:MM (Israel time)\n"
+                f"Available: {names}"
             )
+            return
 
-        @self._router.message(Command("weeklywake"))
-        async def cmd_weeklywake(message: Message) -> None:
-            logger.info(
-                "Received /weeklywake command chat_id=%s text=%r",
-                message.chat.id,
-                message.text,
+        provider_name = parts[1].lower()
+        if len(parts) == 2:
+            await message.reply(await self.run_manual_wake(provider_name))
+            return
+
+        if len(parts) == 3:
+            await message.reply(
+                await self.schedule_wake_at_israel_time(provider_name, parts[2])
             )
-            if str(message.chat.id) != bot_ref._config.telegram.chat_id:
-                logger.warning(
-                    "Ignoring /weeklywake from unauthorized chat_id=%s expected=%s",
-                    message.chat.id,
-                    bot_ref._config.telegram.chat_id,
-                )
-                return
+            return
 
-            parts = (message.text or "").split()
-            if len(parts) < 4:
-                names = ", ".join(bot_ref._providers.keys())
-                await message.reply(
-                    "Usage:\n"
-                    "/weeklywake <provider> DD.MM HH:MM\n"
-                    "Example: /weeklywake codex 17.01 12:00\n"
-                    f"Available: {names}"
-                )
-                return
+        await message.reply(
+            "Usage:\n"
+            "/wake <provider>\n"
+            "/wake <provider> HH:MM (Israel time)"
+        )
 
-            provider_name = parts[1].lower()
-            date_text = parts[2]
-            time_text = parts[3]
+    async def _cmd_weeklywake(self, message: Message) -> None:
+        logger.info(
+            "Received /weeklywake command chat_id=%s text=%r",
+            message.chat.id,
+            message.text,
+        )
+        if not self._is_authorized(message):
+            logger.warning(
+                "Ignoring /weeklywake from unauthorized chat_id=%s expected=%s",
+                message.chat.id,
+                self._config.telegram.chat_id,
+            )
+            return
 
+        parts = (message.text or "").split(maxsplit=4)
+        if len(parts) < 4:
+            names = ", ".join(self._providers.keys())
             await message.reply(
-                await bot_ref.schedule_weekly_wake_at_israel_time(
-                    provider_name, date_text, time_text
-                )
+                "Usage:\n"
+                "/weeklywake <provider> DD.MM HH:MM\n"
+                "Example: /weeklywake codex 17.01 12:00\n"
+                f"Available: {names}"
+            )
+            return
+
+        provider_name = parts[1].lower()
+        date_text = parts[2]
+        time_text = parts[3]
+
+        await message.reply(
+            await self.schedule_weekly_wake_at_israel_time(
+                provider_name, date_text, time_text
             )
+        )
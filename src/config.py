@@ -1,19 +1,30 @@
-"""Application configuration loaded from environment variables."""
+"""Application configuration loaded from environment variables.
+
+Config objects are built once per load and shared; treat them as immutable.
+"""
 
 from __future__ import annotations
 
+import functools
 import os
+import sys
+from collections.abc import Mapping
 from dataclasses import dataclass, field
+from datetime import timedelta
 from enum import Enum
+from types import MappingProxyType
+from typing import Any
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True)
 class TelegramConfig:
     bot_token: str
     chat_id: str
+    poll_timeout: int = 30
+    poll_limit: int = 100
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True)
 class ProviderConfig:
     """Per-provider configuration."""
 
@@ -25,6 +36,17 @@ class ProviderConfig:
     wake_delay_seconds: int
     weekly_window_seconds: int = 7 * 24 * 60 * 60
     weekly_wake_delay_seconds: int = 10
+    # Derived once here; a config reload builds a new object, so they never go stale.
+    rolling_interval: timedelta = field(init=False, repr=False, compare=False)
+    weekly_interval: timedelta = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.rolling_interval = timedelta(
+            seconds=self.window_seconds + self.wake_delay_seconds
+        )
+        self.weekly_interval = timedelta(
+            seconds=self.weekly_window_seconds + self.weekly_wake_delay_seconds
+        )
 
 
 class ResetMode(str, Enum):
@@ -32,7 +54,7 @@ class ResetMode(str, Enum):
     CLOCK_ALIGNED_HOUR = "clock_aligned_hour"
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True)
 class SchedulerConfig:
     state_path: str
     auth_recheck_seconds: int
@@ -40,34 +62,44 @@ class SchedulerConfig:
     retry_max_seconds: int
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True)
 class AppConfig:
     telegram: TelegramConfig
     scheduler: SchedulerConfig
-    providers: dict[str, ProviderConfig] = field(default_factory=dict)
+    providers: Mapping[str, ProviderConfig] = field(default_factory=dict)
 
 
-_PROVIDER_DEFAULTS: dict[str, dict[str, str]] = {
+_RESET_MODE_BY_VALUE: dict[str, ResetMode] = {mode.value: mode for mode in ResetMode}
+
+_PROVIDER_DEFAULTS: dict[str, dict[str, Any]] = {
     "claude": {
         "model": "claude-sonnet-4-5-20250929",
         "wakeup_message": "hi",
-        "reset_mode": ResetMode.CLOCK_ALIGNED_HOUR.value,
-        "window_seconds": "18000",
-        "wake_delay_seconds": "10",
-        "weekly_window_seconds": "604800",
-        "weekly_wake_delay_seconds": "10",
+        "reset_mode": ResetMode.CLOCK_ALIGNED_HOUR,
+        "window_seconds": 18000,
+        "wake_delay_seconds": 10,
+        "weekly_window_seconds": 604800,
+        "weekly_wake_delay_seconds": 10,
     },
     "codex": {
         "model": "gpt-5.4",
         "wakeup_message": "say hi",
-        "reset_mode": ResetMode.ROLLING.value,
-        "window_seconds": "18000",
-        "wake_delay_seconds": "10",
-        "weekly_window_seconds": "604800",
-        "weekly_wake_delay_seconds": "10",
+        "reset_mode": ResetMode.ROLLING,
+        "window_seconds": 18000,
+        "wake_delay_seconds": 10,
+        "weekly_window_seconds": 604800,
+        "weekly_wake_delay_seconds": 10,
     },
 }
 
+# (ProviderConfig attribute, env key suffix, fallback default, minimum)
+_PROVIDER_INT_FIELDS: tuple[tuple[str, str, int, int], ...] = (
+    ("window_seconds", "WINDOW_SECONDS", 18000, 1),
+    ("wake_delay_seconds", "WAKE_DELAY_SECONDS", 10, 0),
+    ("weekly_window_seconds", "WEEKLY_WINDOW_SECONDS", 7 * 24 * 60 * 60, 1),
+    ("weekly_wake_delay_seconds", "WEEKLY_WAKE_DELAY_SECONDS", 10, 0),
+)
+
 
 def _normalize_env_aliases() -> None:
     """Normalize legacy environment variable names used by CLIs."""
@@ -79,15 +111,21 @@ def _normalize_env_aliases() -> None:
             os.environ["CLAUDE_CODE_OAUTH_TOKEN"] = legacy
 
 
-def _env(key: str, default: str | None = None) -> str:
-    value = os.environ.get(key, default)
+def _env(env: Mapping[str, str], key: str, default: str | None = None) -> str:
+    value = env.get(key, default)
     if value is None:
         raise RuntimeError(f"Required environment variable {key} is not set")
     return value
 
 
-def _env_int(key: str, default: int, *, minimum: int = 0) -> int:
-    raw_value = os.environ.get(key)
+def _env_int(
+    env: Mapping[str, str],
+    key: str,
+    default: int,
+    *,
+    minimum: int = 0,
+) -> int:
+    raw_value = env.get(key)
     if raw_value is None:
         value = default
     else:
@@ -103,80 +141,85 @@ def _env_int(key: str, default: int, *, minimum: int = 0) -> int:
     return value
 
 
+def _build_provider_config(name: str, env: Mapping[str, str]) -> ProviderConfig:
+    """Build one provider config from its ``<NAME>_*`` environment variables."""
+    defaults = _PROVIDER_DEFAULTS.get(name, {})
+    prefix = name.upper()
+
+    reset_mode_key = f"{prefix}_RESET_MODE"
+    reset_mode_value = env.get(reset_mode_key)
+    if reset_mode_value is None:
+        reset_mode = defaults.get("reset_mode", ResetMode.ROLLING)
+    else:
+        reset_mode = _RESET_MODE_BY_VALUE.get(reset_mode_value)
+        if reset_mode is None:
+            raise RuntimeError(
+                f"Unsupported {reset_mode_key}: {reset_mode_value!r}. "
+                f"Expected one of: {list(_RESET_MODE_BY_VALUE)}"
+            )
+
+    int_fields = {
+        attr: _env_int(
+            env,
+            f"{prefix}_{suffix}",
+            defaults.get(attr, fallback),
+            minimum=minimum,
+        )
+        for attr, suffix, fallback, minimum in _PROVIDER_INT_FIELDS
+    }
+
+    return ProviderConfig(
+        name=name,
+        model=_env(env, f"{prefix}_MODEL", defaults.get("model", "")),
+        wakeup_message=_env(
+            env,
+            f"{prefix}_WAKEUP_MESSAGE",
+            defaults.get("wakeup_message", "hi"),
+        ),
+        reset_mode=reset_mode,
+        **int_fields,
+    )
+
+
 def load_config() -> AppConfig:
     """Load configuration from environment variables."""
     _normalize_env_aliases()
+    # Snapshot once: plain dict lookups are cheaper than the os.environ proxy.
+    env = dict(os.environ)
 
     telegram = TelegramConfig(
-        bot_token=_env("TELEGRAM_BOT_TOKEN"),
-        chat_id=_env("TELEGRAM_CHAT_ID"),
+        bot_token=_env(env, "TELEGRAM_BOT_TOKEN"),
+        chat_id=_env(env, "TELEGRAM_CHAT_ID"),
+        poll_timeout=_env_int(env, "TELEGRAM_POLL_TIMEOUT", 30, minimum=1),
+        poll_limit=_env_int(env, "TELEGRAM_POLL_LIMIT", 100, minimum=1),
     )
 
     enabled = [
-        name.strip()
-        for name in _env("ENABLED_PROVIDERS", "claude,codex").split(",")
+        sys.intern(name.strip())
+        for name in _env(env, "ENABLED_PROVIDERS", "claude,codex").split(",")
         if name.strip()
     ]
 
-    providers: dict[str, ProviderConfig] = {}
-    for name in enabled:
-        defaults = _PROVIDER_DEFAULTS.get(name, {})
-        prefix = name.upper()
-        reset_mode_value = _env(
-            f"{prefix}_RESET_MODE",
-            defaults.get("reset_mode", ResetMode.ROLLING.value),
-        )
-        try:
-            reset_mode = ResetMode(reset_mode_value)
-        except ValueError as exc:
-            raise RuntimeError(
-                f"Unsupported {prefix}_RESET_MODE: {reset_mode_value!r}. "
-                f"Expected one of: {[mode.value for mode in ResetMode]}"
-            ) from exc
-
-        providers[name] = ProviderConfig(
-            name=name,
-            model=_env(f"{prefix}_MODEL", defaults.get("model", "")),
-            wakeup_message=_env(
-                f"{prefix}_WAKEUP_MESSAGE",
-                defaults.get("wakeup_message", "hi"),
-            ),
-            reset_mode=reset_mode,
-            window_seconds=_env_int(
-                f"{prefix}_WINDOW_SECONDS",
-                int(defaults.get("window_seconds", "18000")),
-                minimum=1,
-            ),
-            wake_delay_seconds=_env_int(
-                f"{prefix}_WAKE_DELAY_SECONDS",
-                int(defaults.get("wake_delay_seconds", "10")),
-                minimum=0,
-            ),
-            weekly_window_seconds=_env_int(
-                f"{prefix}_WEEKLY_WINDOW_SECONDS",
-                int(defaults.get("weekly_window_seconds", str(7 * 24 * 60 * 60))),
-                minimum=1,
-            ),
-            weekly_wake_delay_seconds=_env_int(
-                f"{prefix}_WEEKLY_WAKE_DELAY_SECONDS",
-                int(defaults.get("weekly_wake_delay_seconds", "10")),
-                minimum=0,
-            ),
-        )
+    providers = MappingProxyType(
+        {name: _build_provider_config(name, env) for name in enabled}
+    )
 
     scheduler = SchedulerConfig(
-        state_path=_env("SCHEDULER_STATE_PATH", "data/scheduler_state.json"),
+        state_path=_env(env, "SCHEDULER_STATE_PATH", "data/scheduler_state.json"),
         auth_recheck_seconds=_env_int(
+            env,
             "SCHEDULER_AUTH_RECHECK_SECONDS",
             60,
             minimum=1,
         ),
         retry_base_seconds=_env_int(
+            env,
             "SCHEDULER_RETRY_BASE_SECONDS",
             60,
             minimum=1,
         ),
         retry_max_seconds=_env_int(
+            env,
             "SCHEDULER_RETRY_MAX_SECONDS",
             3600,
             minimum=1,
@@ -193,3 +236,14 @@ def load_config() -> AppConfig:
         scheduler=scheduler,
         providers=providers,
     )
+
+
+@functools.lru_cache(maxsize=1)
+def load_config_cached() -> AppConfig:
+    """Return the last loaded configuration, loading it on first use."""
+    return load_config()
+
+
+def invalidate_config_cache() -> None:
+    """Drop the cached configuration so the next access reloads it."""
+    load_config_cached.cache_clear()
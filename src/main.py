@@ -12,6 +12,11 @@ from src.providers.base import AuthStatus
 from src.providers.registry import build_providers
 from src.scheduler import WakeupScheduler
 
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - uvloop is unavailable on Windows
+    uvloop = None
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
@@ -22,17 +27,14 @@ logger = logging.getLogger(__name__)
 
 async def startup_auth_check(bot: TelegramBot) -> None:
     """Check auth for all providers on startup and notify via Telegram."""
+    # check_all_auth already runs every provider's check concurrently; the
+    # results are reported in one message to stay clear of Telegram limits.
     results = await bot.check_all_auth()
 
     lines = ["Pobudka started. Auth status:\n"]
-    needs_auth: list[str] = []
-
-    for name, status in results.items():
-        lines.append(f"  {name}: {status.name}")
-        if status != AuthStatus.OK:
-            needs_auth.append(name)
+    lines.extend(f"  {name}: {status.name}" for name, status in results.items())
 
-    if needs_auth:
+    if any(status is not AuthStatus.OK for status in results.values()):
         lines.append("\nUse /auth &lt;provider&gt; to attempt authentication manually.")
 
     await bot.send("\n".join(lines))
@@ -77,4 +79,7 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -2,9 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
+import re
+from collections.abc import Iterable
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import Protocol
+from typing import ClassVar, Protocol
+
+_ANSI_ESCAPE_BYTES_RE = re.compile(rb"\x1b\[[0-9;?]*[A-Za-z]")
+_SCAN_OVERLAP_BYTES = 64
+_READ_CHUNK_BYTES = 4096
+_MAX_ESCAPE_BYTES = 16
 
 
 class AuthStatus(Enum):
@@ -66,3 +74,121 @@ class Provider(Protocol):
     async def cancel_device_auth(self) -> None:
         """Cancel a running device-auth process, if any."""
         ...
+
+
+def contains_keyword(text: str, keywords: Iterable[str]) -> bool:
+    """Case-insensitively check ``text`` for any of the lowercase ``keywords``."""
+    lower = text.lower()
+    return any(keyword in lower for keyword in keywords)
+
+
+class SubprocessProviderBase:
+    """Shared device-auth process handling for CLI-backed providers.
+
+    Subclasses set the bytes patterns that recognise the device code and
+    verification URL in the CLI's output.
+    """
+
+    __slots__ = ("_device_auth_proc",)
+
+    _device_code_re: ClassVar[re.Pattern[bytes]]
+    _device_url_re: ClassVar[re.Pattern[bytes]]
+
+    def __init__(self) -> None:
+        self._device_auth_proc: asyncio.subprocess.Process | None = None
+
+    async def wait_for_device_auth(self) -> bool:
+        """Wait for the device-auth CLI process to complete."""
+        if self._device_auth_proc is None:
+            return False
+
+        try:
+            await asyncio.wait_for(self._device_auth_proc.wait(), timeout=300)
+            success = self._device_auth_proc.returncode == 0
+            self._device_auth_proc = None
+            return success
+        except asyncio.TimeoutError:
+            await self.cancel_device_auth()
+            return False
+
+    async def cancel_device_auth(self) -> None:
+        """Kill any running device-auth process."""
+        if self._device_auth_proc is not None:
+            try:
+                self._device_auth_proc.kill()
+                await self._device_auth_proc.wait()
+            except ProcessLookupError:
+                pass
+            self._device_auth_proc = None
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    async def _read_initial_output(self, timeout: int = 15) -> bytes | None:
+        """Read from the device-auth process until we get enough output.
+
+        Returns the raw output bytes with ANSI escapes already stripped, or
+        None if the process printed nothing.
+        """
+        if self._device_auth_proc is None or self._device_auth_proc.stdout is None:
+            return None
+
+        stdout = self._device_auth_proc.stdout
+        code_re = self._device_code_re
+        url_re = self._device_url_re
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        buf = bytearray()
+        cleaned = bytearray()
+        stripped_to = 0
+        scanned_to = 0
+        code_seen = url_seen = False
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                chunk = await asyncio.wait_for(
+                    stdout.read(_READ_CHUNK_BYTES),
+                    timeout=remaining,
+                )
+            except asyncio.TimeoutError:
+                break
+            if not chunk:
+                break
+            buf.extend(chunk)
+            # Strip ANSI from the new bytes only, holding back an escape
+            # sequence that may continue in the next chunk.
+            strip_end = _complete_escape_boundary(buf, stripped_to)
+            cleaned.extend(_ANSI_ESCAPE_BYTES_RE.sub(b"", buf[stripped_to:strip_end]))
+            stripped_to = strip_end
+            # Only match within complete lines: a read can end mid-token, and
+            # a partial URL or code would otherwise be taken as the answer.
+            line_end = cleaned.rfind(b"\n") + 1
+            if line_end <= scanned_to:
+                continue
+            # Only rescan the new lines (plus a small overlap for matches
+            # straddling a chunk boundary) so long banners stay linear.
+            start = max(0, scanned_to - _SCAN_OVERLAP_BYTES)
+            scanned_to = line_end
+            if not code_seen:
+                code_seen = code_re.search(cleaned, start, line_end) is not None
+            if not url_seen:
+                url_seen = url_re.search(cleaned, start, line_end) is not None
+            if code_seen and url_seen:
+                return bytes(cleaned[:line_end])
+
+        if not buf:
+            return None
+        # Flush an escape sequence still held back from the last chunk.
+        cleaned.extend(_ANSI_ESCAPE_BYTES_RE.sub(b"", buf[stripped_to:]))
+        return bytes(cleaned)
+
+
+def _complete_escape_boundary(buf: bytearray, start: int) -> int:
+    """Return where ``buf`` stops having a possibly unfinished ANSI escape."""
+    esc = buf.rfind(b"\x1b", max(start, len(buf) - _MAX_ESCAPE_BYTES))
+    if esc == -1 or _ANSI_ESCAPE_BYTES_RE.match(buf, esc):
+        return len(buf)
+    return esc
@@ -2,25 +2,29 @@
 
 from __future__ import annotations
 
-import asyncio
-import json
 import logging
 import re
+from typing import Any
 
+from src import jsonutil
 from src.config import ProviderConfig
 from src.providers.base import (
     AuthStatus,
     DeviceCodeInfo,
+    SubprocessProviderBase,
     WakeupFailureKind,
     WakeupResult,
+    contains_keyword,
 )
 from src.providers.subprocess import CLIResult, run_cli, start_long_running
 
 logger = logging.getLogger(__name__)
 
-# Patterns for parsing device-code output
-_DEVICE_CODE_RE = re.compile(r"(?:code|Code)[:\s]+([A-Z0-9-]{4,12})", re.IGNORECASE)
-_DEVICE_URL_RE = re.compile(r"(https?://\S*device\S*)", re.IGNORECASE)
+# Patterns for parsing device-code output (bytes: matched before decoding)
+_DEVICE_CODE_RE = re.compile(
+    rb"(?:code|Code)[:\s]+([A-Z0-9-]{4,12})", re.IGNORECASE
+)
+_DEVICE_URL_RE = re.compile(rb"(https?://\S*device\S*)", re.IGNORECASE)
 _ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
 _AUTH_COMMAND_RE = re.compile(r"^\s*auth\b", re.IGNORECASE | re.MULTILINE)
 
@@ -30,59 +34,68 @@ _RATE_LIMIT_RE = re.compile(
     re.IGNORECASE,
 )
 
-_AUTH_ERROR_KEYWORDS = (
-    "invalid api key",
-    "not authenticated",
-    "not logged in",
-    "authentication required",
-    "please log in",
-    "please run /login",
-    "login required",
-    "/login",
-    "unauthorized",
+# Lowercase phrases matched as plain substrings of the lowercased text.
+_AUTH_ERROR_KEYWORDS = frozenset(
+    {
+        "invalid api key",
+        "not authenticated",
+        "not logged in",
+        "authentication required",
+        "please log in",
+        "please run /login",
+        "login required",
+        "/login",
+        "unauthorized",
+    }
+)
+
+_CHECK_AUTH_ARGV = (
+    "claude",
+    "-p",
+    "hi",
+    "--output-format",
+    "json",
+    "--max-turns",
+    "1",
 )
 
 
-class ClaudeProvider:
+class ClaudeProvider(SubprocessProviderBase):
     """Provider that wraps the Claude Code CLI."""
 
+    __slots__ = ("_config", "_supports_device_auth", "_wakeup_argv")
+
+    _device_code_re = _DEVICE_CODE_RE
+    _device_url_re = _DEVICE_URL_RE
+
     def __init__(self, config: ProviderConfig) -> None:
+        super().__init__()
         self._config = config
-        self._device_auth_proc: asyncio.subprocess.Process | None = None
         self._supports_device_auth: bool | None = None
-
-    @property
-    def name(self) -> str:
-        return "Claude"
-
-    async def check_auth(self) -> AuthStatus:
-        """Check auth by sending a minimal request."""
-        result = await run_cli(
+        self._wakeup_argv: tuple[str, ...] = (
             "claude",
             "-p",
-            "hi",
+            config.wakeup_message,
             "--output-format",
             "json",
             "--max-turns",
             "1",
-            timeout=30,
+            "--model",
+            config.model,
         )
+
+    @property
+    def name(self) -> str:
+        return "Claude"
+
+    async def check_auth(self) -> AuthStatus:
+        """Check auth by sending a minimal request."""
+        result = await run_cli(*_CHECK_AUTH_ARGV, timeout=30, binary=True)
         return self._parse_auth_status(result)
 
     async def send_wakeup(self) -> WakeupResult:
         """Send a wake-up message via Claude CLI."""
-        result = await run_cli(
-            "claude",
-            "-p",
-            self._config.wakeup_message,
-            "--output-format",
-            "json",
-            "--max-turns",
-            "1",
-            "--model",
-            self._config.model,
-            timeout=60,
-        )
+        result = await run_cli(*self._wakeup_argv, timeout=60, binary=True)
 
         if result.returncode == -1:  # timeout
             return WakeupResult(
@@ -118,73 +131,26 @@ class ClaudeProvider:
             await self.cancel_device_auth()
             return None
 
-        cleaned = _strip_ansi(output)
-        code_match = _DEVICE_CODE_RE.search(cleaned)
-        url_match = _DEVICE_URL_RE.search(cleaned)
+        code_match = _DEVICE_CODE_RE.search(output)
+        url_match = _DEVICE_URL_RE.search(output)
 
         if not code_match or not url_match:
             logger.warning(
                 "Could not parse device code from Claude CLI output: %s",
-                cleaned[:300],
+                output[:300].decode(errors="replace"),
             )
             await self.cancel_device_auth()
             return None
 
-        return DeviceCodeInfo(code=code_match.group(1), url=url_match.group(1))
-
-    async def wait_for_device_auth(self) -> bool:
-        """Wait for the device-auth CLI process to complete."""
-        if self._device_auth_proc is None:
-            return False
-
-        try:
-            await asyncio.wait_for(self._device_auth_proc.wait(), timeout=300)
-            success = self._device_auth_proc.returncode == 0
-            self._device_auth_proc = None
-            return success
-        except asyncio.TimeoutError:
-            await self.cancel_device_auth()
-            return False
-
-    async def cancel_device_auth(self) -> None:
-        """Kill any running device-auth process."""
-        if self._device_auth_proc is not None:
-            try:
-                self._device_auth_proc.kill()
-                await self._device_auth_proc.wait()
-            except ProcessLookupError:
-                pass
-            self._device_auth_proc = None
+        return DeviceCodeInfo(
+            code=code_match.group(1).decode(),
+            url=url_match.group(1).decode(errors="replace"),
+        )
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
-    async def _read_initial_output(self, timeout: int = 15) -> str | None:
-        """Read from the device-auth process until we get enough output."""
-        if self._device_auth_proc is None or self._device_auth_proc.stdout is None:
-            return None
-
-        chunks: list[str] = []
-        try:
-            while True:
-                line = await asyncio.wait_for(
-                    self._device_auth_proc.stdout.readline(),
-                    timeout=timeout,
-                )
-                if not line:
-                    break
-                decoded = line.decode(errors="replace")
-                chunks.append(decoded)
-                # Stop once we see something that looks like a code or URL
-                combined = _strip_ansi("".join(chunks))
-                if _DEVICE_CODE_RE.search(combined) and _DEVICE_URL_RE.search(combined):
-                    break
-        except asyncio.TimeoutError:
-            pass
-
-        return "".join(chunks) if chunks else None
-
     async def _detect_device_auth_support(self) -> bool:
         """Cache whether current Claude CLI exposes the auth command."""
         if self._supports_device_auth is not None:
@@ -200,18 +166,17 @@ class ClaudeProvider:
         if result.returncode == -1:
             return AuthStatus.ERROR
 
-        try:
-            data = json.loads(result.stdout)
-        except (json.JSONDecodeError, ValueError):
+        data = _load_json_object(result.stdout)
+        if data is None:
             # Fall back to text matching on combined output
-            combined = f"{result.stdout} {result.stderr}".lower()
-            if any(kw in combined for kw in _AUTH_ERROR_KEYWORDS):
+            combined = f"{result.stdout_text} {result.stderr}"
+            if contains_keyword(combined, _AUTH_ERROR_KEYWORDS):
                 return AuthStatus.NOT_AUTHENTICATED
             return AuthStatus.ERROR
 
         if data.get("is_error"):
-            text = data.get("result", "").lower()
-            if any(kw in text for kw in _AUTH_ERROR_KEYWORDS):
+            text = data.get("result", "")
+            if contains_keyword(text, _AUTH_ERROR_KEYWORDS):
                 return AuthStatus.NOT_AUTHENTICATED
             return AuthStatus.ERROR
 
@@ -219,12 +184,10 @@ class ClaudeProvider:
 
     def _parse_wakeup_result(self, result: CLIResult) -> WakeupResult:
         """Parse a wake-up response from claude -p JSON output."""
-        combined = f"{result.stdout} {result.stderr}"
-
-        try:
-            data = json.loads(result.stdout)
-        except (json.JSONDecodeError, ValueError):
+        data = _load_json_object(result.stdout)
+        if data is None:
             if not result.ok:
+                combined = f"{result.stdout_text} {result.stderr}"
                 return WakeupResult(
                     success=False,
                     message=combined[:300],
@@ -235,7 +198,7 @@ class ClaudeProvider:
         if data.get("is_error"):
             text = data.get("result", "")
             rate_match = _RATE_LIMIT_RE.search(text)
-            if any(kw in text.lower() for kw in _AUTH_ERROR_KEYWORDS):
+            if contains_keyword(text, _AUTH_ERROR_KEYWORDS):
                 return WakeupResult(
                     success=False,
                     message=f"Auth error: {text}",
@@ -263,3 +226,18 @@ class ClaudeProvider:
 def _strip_ansi(text: str) -> str:
     """Strip ANSI escape sequences from CLI output."""
     return _ANSI_ESCAPE_RE.sub("", text)
+
+
+def _load_json_object(stdout: str | bytes) -> dict[str, Any] | None:
+    """Parse CLI stdout as a JSON object, or return None if it is not one.
+
+    Plain-text output (the usual shape of auth failures) is rejected by a
+    first-character check instead of raising and catching a decode error.
+    """
+    if stdout.lstrip()[:1] not in (b"{", "{"):
+        return None
+    try:
+        data = jsonutil.loads(stdout)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
@@ -2,26 +2,26 @@
 
 from __future__ import annotations
 
-import asyncio
-import json
 import logging
 import re
 
+from src import jsonutil
 from src.config import ProviderConfig
 from src.providers.base import (
     AuthStatus,
     DeviceCodeInfo,
+    SubprocessProviderBase,
     WakeupFailureKind,
     WakeupResult,
+    contains_keyword,
 )
 from src.providers.subprocess import CLIResult, run_cli, start_long_running
 
 logger = logging.getLogger(__name__)
 
-# Patterns for parsing device-code output
-_DEVICE_CODE_RE = re.compile(r"\b([A-Z0-9]{4,}(?:-[A-Z0-9]{2,})+)\b")
-_DEVICE_URL_RE = re.compile(r"(https?://\S*(?:device|auth)\S*)", re.IGNORECASE)
-_ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+# Patterns for parsing device-code output (bytes: matched before decoding)
+_DEVICE_CODE_RE = re.compile(rb"\b([A-Z0-9]{4,}(?:-[A-Z0-9]{2,})+)\b")
+_DEVICE_URL_RE = re.compile(rb"(https?://\S*(?:device|auth)\S*)", re.IGNORECASE)
 
 # Pattern for parsing rate-limit reset time
 _RATE_LIMIT_RE = re.compile(
@@ -29,32 +29,59 @@ _RATE_LIMIT_RE = re.compile(
     re.IGNORECASE,
 )
 
-_AUTH_ERROR_KEYWORDS = (
-    "could not be refreshed",
-    "refresh_token_reused",
-    "not logged in",
-    "not authenticated",
-    "authentication required",
-    "please log in",
-    "login required",
-    "unauthorized",
-    "401 unauthorized",
-    "missing bearer",
-    "sign in again",
+# Lowercase phrases matched as plain substrings of the lowercased text.
+_AUTH_ERROR_KEYWORDS = frozenset(
+    {
+        "could not be refreshed",
+        "refresh_token_reused",
+        "not logged in",
+        "not authenticated",
+        "authentication required",
+        "please log in",
+        "login required",
+        "unauthorized",
+        "401 unauthorized",
+        "missing bearer",
+        "sign in again",
+    }
 )
 
-_RATE_LIMIT_KEYWORDS = (
-    "usage limit",
-    "rate limit",
+_RATE_LIMIT_KEYWORDS = frozenset(
+    {
+        "usage limit",
+        "rate limit",
+    }
 )
 
+_ERROR_EVENT_TYPES = frozenset({"error", "turn.failed"})
 
-class CodexProvider:
+_CHECK_AUTH_ARGV = ("codex", "login", "status")
+
+# `codex exec --json` streams one JSON event per line for the whole turn.
+_EXEC_OUTPUT_LIMIT = 4 * 1024 * 1024
+
+
+class CodexProvider(SubprocessProviderBase):
     """Provider that wraps the OpenAI Codex CLI."""
 
+    __slots__ = ("_config", "_wakeup_argv")
+
+    _device_code_re = _DEVICE_CODE_RE
+    _device_url_re = _DEVICE_URL_RE
+
     def __init__(self, config: ProviderConfig) -> None:
+        super().__init__()
         self._config = config
-        self._device_auth_proc: asyncio.subprocess.Process | None = None
+        self._wakeup_argv: tuple[str, ...] = (
+            "codex",
+            "exec",
+            config.wakeup_message,
+            "--full-auto",
+            "--json",
+            "--skip-git-repo-check",
+            "-m",
+            config.model,
+        )
 
     @property
     def name(self) -> str:
@@ -62,15 +89,15 @@ class CodexProvider:
 
     async def check_auth(self) -> AuthStatus:
         """Check auth via codex login status."""
-        result = await run_cli("codex", "login", "status", timeout=10)
-        text = f"{result.stdout} {result.stderr}".lower()
+        result = await run_cli(*_CHECK_AUTH_ARGV, timeout=10)
+        text = f"{result.stdout} {result.stderr}"
 
         if not result.ok:
-            if any(kw in text for kw in _AUTH_ERROR_KEYWORDS):
+            if contains_keyword(text, _AUTH_ERROR_KEYWORDS):
                 return AuthStatus.NOT_AUTHENTICATED
             return AuthStatus.ERROR
 
-        if "logged in" in text:
+        if "logged in" in text.lower():
             return AuthStatus.OK
 
         return AuthStatus.NOT_AUTHENTICATED
@@ -78,15 +105,10 @@ class CodexProvider:
     async def send_wakeup(self) -> WakeupResult:
         """Send a wake-up message via Codex CLI."""
         result = await run_cli(
-            "codex",
-            "exec",
-            self._config.wakeup_message,
-            "--full-auto",
-            "--json",
-            "--skip-git-repo-check",
-            "-m",
-            self._config.model,
+            *self._wakeup_argv,
             timeout=60,
+            binary=True,
+            output_limit=_EXEC_OUTPUT_LIMIT,
         )
 
         if result.returncode == -1:  # timeout
@@ -113,106 +135,60 @@ class CodexProvider:
             await self.cancel_device_auth()
             return None
 
-        cleaned = _strip_ansi(output)
-        code_match = _DEVICE_CODE_RE.search(cleaned)
-        url_match = _DEVICE_URL_RE.search(cleaned)
+        code_match = _DEVICE_CODE_RE.search(output)
+        url_match = _DEVICE_URL_RE.search(output)
 
         if not code_match or not url_match:
             logger.warning(
                 "Could not parse device code from Codex CLI output: %s",
-                cleaned[:300],
+                output[:300].decode(errors="replace"),
             )
             await self.cancel_device_auth()
             return None
 
-        return DeviceCodeInfo(code=code_match.group(1), url=url_match.group(1))
-
-    async def wait_for_device_auth(self) -> bool:
-        """Wait for the device-auth CLI process to complete."""
-        if self._device_auth_proc is None:
-            return False
-
-        try:
-            await asyncio.wait_for(self._device_auth_proc.wait(), timeout=300)
-            success = self._device_auth_proc.returncode == 0
-            self._device_auth_proc = None
-            return success
-        except asyncio.TimeoutError:
-            await self.cancel_device_auth()
-            return False
-
-    async def cancel_device_auth(self) -> None:
-        """Kill any running device-auth process."""
-        if self._device_auth_proc is not None:
-            try:
-                self._device_auth_proc.kill()
-                await self._device_auth_proc.wait()
-            except ProcessLookupError:
-                pass
-            self._device_auth_proc = None
+        return DeviceCodeInfo(
+            code=code_match.group(1).decode(),
+            url=url_match.group(1).decode(errors="replace"),
+        )
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
-    async def _read_initial_output(self, timeout: int = 15) -> str | None:
-        """Read from the device-auth process until we get enough output."""
-        if self._device_auth_proc is None or self._device_auth_proc.stdout is None:
-            return None
-
-        chunks: list[str] = []
-        try:
-            while True:
-                line = await asyncio.wait_for(
-                    self._device_auth_proc.stdout.readline(),
-                    timeout=timeout,
-                )
-                if not line:
-                    break
-                decoded = line.decode(errors="replace")
-                chunks.append(decoded)
-                combined = _strip_ansi("".join(chunks))
-                if _DEVICE_CODE_RE.search(combined) and _DEVICE_URL_RE.search(combined):
-                    break
-        except asyncio.TimeoutError:
-            pass
-
-        return "".join(chunks) if chunks else None
-
     def _parse_wakeup_result(self, result: CLIResult) -> WakeupResult:
         """Parse a wake-up response from codex exec --json JSONL output."""
-        combined = f"{result.stdout} {result.stderr}"
-
-        # Codex outputs JSONL -- parse each line, look for errors or completion
+        # Codex outputs JSONL -- only the last error event with a message
+        # matters, so walk backwards and skip lines that cannot be one.
         has_error = False
         error_message = ""
-        rate_limit_reset: str | None = None
 
-        for line in result.stdout.splitlines():
-            line = line.strip()
-            if not line:
+        stdout = result.stdout
+        if isinstance(stdout, str):
+            stdout = stdout.encode()
+        for line in reversed(stdout.splitlines()):
+            if b'"error"' not in line and b'"turn.failed"' not in line:
                 continue
             try:
-                event = json.loads(line)
-            except (json.JSONDecodeError, ValueError):
+                event = jsonutil.loads(line)
+            except ValueError:
                 continue
 
-            event_type = event.get("type", "")
+            if event.get("type", "") not in _ERROR_EVENT_TYPES:
+                continue
 
-            if event_type in ("error", "turn.failed"):
-                has_error = True
-                # "error" events put message at top level;
-                # "turn.failed" events nest it under "error.message"
-                message = event.get("message", "")
-                if not message and isinstance(event.get("error"), dict):
-                    message = event["error"].get("message", str(event["error"]))
-                if message:
-                    error_message = message
+            has_error = True
+            # "error" events put message at top level;
+            # "turn.failed" events nest it under "error.message"
+            message = event.get("message", "")
+            if not message and isinstance(event.get("error"), dict):
+                message = event["error"].get("message", str(event["error"]))
+            if message:
+                error_message = message
+                break
 
         if has_error and error_message:
             # Check for auth errors
-            lower = error_message.lower()
-            if any(kw in lower for kw in _AUTH_ERROR_KEYWORDS):
+            if contains_keyword(error_message, _AUTH_ERROR_KEYWORDS):
                 return WakeupResult(
                     success=False,
                     message=f"Auth error: {error_message}",
@@ -220,7 +196,7 @@ class CodexProvider:
                 )
 
             # Check for rate limits
-            if any(kw in lower for kw in _RATE_LIMIT_KEYWORDS):
+            if contains_keyword(error_message, _RATE_LIMIT_KEYWORDS):
                 rate_match = _RATE_LIMIT_RE.search(error_message)
                 return WakeupResult(
                     success=False,
@@ -236,6 +212,7 @@ class CodexProvider:
             )
 
         if not result.ok and not has_error:
+            combined = f"{result.stdout_text} {result.stderr}"
             return WakeupResult(
                 success=False,
                 message=combined[:300],
@@ -244,7 +221,3 @@ class CodexProvider:
 
         return WakeupResult(success=True, message="OK")
 
-
-def _strip_ansi(text: str) -> str:
-    """Strip ANSI escape sequences from CLI output."""
-    return _ANSI_ESCAPE_RE.sub("", text)
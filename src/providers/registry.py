@@ -2,28 +2,39 @@
 
 from __future__ import annotations
 
+import importlib
 import logging
 
-from src.config import AppConfig, ProviderConfig
+from src.config import AppConfig
 from src.providers.base import Provider
-from src.providers.claude import ClaudeProvider
-from src.providers.codex import CodexProvider
 
 logger = logging.getLogger(__name__)
 
-_FACTORIES: dict[str, type] = {
-    "claude": ClaudeProvider,
-    "codex": CodexProvider,
+# Provider modules are imported on demand so a disabled provider never pays
+# for its imports and regex compilation.
+_FACTORY_PATHS: dict[str, tuple[str, str]] = {
+    "claude": ("src.providers.claude", "ClaudeProvider"),
+    "codex": ("src.providers.codex", "CodexProvider"),
 }
 
 
+def _load_factory(name: str) -> type | None:
+    path = _FACTORY_PATHS.get(name)
+    if path is None:
+        return None
+    module_name, class_name = path
+    return getattr(importlib.import_module(module_name), class_name)
+
+
 def build_providers(config: AppConfig) -> dict[str, Provider]:
     """Instantiate providers based on configuration."""
     providers: dict[str, Provider] = {}
     for name, provider_config in config.providers.items():
-        factory = _FACTORIES.get(name)
+        factory = _load_factory(name)
         if factory is None:
-            logger.error("Unknown provider: %s (available: %s)", name, list(_FACTORIES))
+            logger.error(
+                "Unknown provider: %s (available: %s)", name, list(_FACTORY_PATHS)
+            )
             continue
         providers[name] = factory(provider_config)
         logger.info("Registered provider: %s", name)
@@ -9,23 +9,40 @@ from dataclasses import dataclass
 logger = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT = 60
+DEFAULT_OUTPUT_LIMIT = 64 * 1024  # asyncio's own StreamReader default
 
+# Every descriptor we open is non-inheritable (PEP 446), so there is nothing
+# for the child to close. close_fds=False only skips the child's sweep over
+# open descriptors before exec; it does not enable posix_spawn, which CPython
+# uses only for executables given with a directory component.
+_CLOSE_FDS = False
 
-@dataclass
+
+@dataclass(slots=True)
 class CLIResult:
     returncode: int
-    stdout: str
+    stdout: str | bytes
+    """Decoded and stripped text, or the raw bytes when run with ``binary=True``."""
     stderr: str
 
     @property
     def ok(self) -> bool:
         return self.returncode == 0
 
+    @property
+    def stdout_text(self) -> str:
+        """Stdout as stripped text, decoding it if it was captured as bytes."""
+        if isinstance(self.stdout, bytes):
+            return self.stdout.decode(errors="replace").strip()
+        return self.stdout
+
 
 async def run_cli(
     *args: str,
     timeout: int = DEFAULT_TIMEOUT,
     env: dict[str, str] | None = None,
+    binary: bool = False,
+    output_limit: int = DEFAULT_OUTPUT_LIMIT,
 ) -> CLIResult:
     """Run a CLI command and capture output.
 
@@ -33,6 +50,10 @@ async def run_cli(
         *args: Command and arguments.
         timeout: Seconds before killing the process.
         env: Optional environment variable overrides.
+        binary: Return stdout as raw bytes, skipping decode and strip. Useful
+            when the caller only feeds it to a JSON parser.
+        output_limit: Pipe buffer size in bytes; reading pauses once about
+            twice this much output is buffered. Raise it for chatty commands.
 
     Returns:
         CLIResult with returncode, stdout, and stderr.
@@ -45,6 +66,8 @@ async def run_cli(
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
         env=env,
+        close_fds=_CLOSE_FDS,
+        limit=output_limit,
     )
 
     try:
@@ -56,9 +79,13 @@ async def run_cli(
         proc.kill()
         await proc.wait()
         logger.warning("Command timed out after %ds: %s", timeout, cmd_str)
-        return CLIResult(returncode=-1, stdout="", stderr=f"Timed out after {timeout}s")
+        return CLIResult(
+            returncode=-1,
+            stdout=b"" if binary else "",
+            stderr=f"Timed out after {timeout}s",
+        )
 
-    stdout = stdout_bytes.decode(errors="replace").strip()
+    stdout = stdout_bytes if binary else stdout_bytes.decode(errors="replace").strip()
     stderr = stderr_bytes.decode(errors="replace").strip()
 
     logger.debug(
@@ -91,4 +118,5 @@ async def start_long_running(
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.STDOUT,
         env=env,
+        close_fds=_CLOSE_FDS,
     )
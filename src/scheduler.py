@@ -3,24 +3,45 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import functools
 import logging
 import os
 import re
-from dataclasses import dataclass, replace
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Awaitable, Callable
+from typing import Any, Awaitable, Callable, Coroutine
+from zoneinfo import ZoneInfo
 
+from src import jsonutil
 from src.config import AppConfig, ProviderConfig, ResetMode
 from src.providers.base import Provider, WakeupFailureKind, WakeupResult
 
 logger = logging.getLogger(__name__)
 
-_DURATION_PART_RE = re.compile(
-    r"(?P<value>\d+)\s*(?P<unit>day|days|hour|hours|minute|minutes|second|seconds)",
-    re.IGNORECASE,
-)
+# Matched against lowercased text. Plural suffixes need no alternatives of
+# their own: the singular already matches and the trailing "s" is ignored.
+_DURATION_PART_RE = re.compile(r"(\d+)\s*(day|hour|minute|second)")
+_UNIT_SECONDS = {
+    "day": 24 * 60 * 60,
+    "hour": 60 * 60,
+    "minute": 60,
+    "second": 1,
+}
+
+_ISRAEL_TZ = ZoneInfo("Asia/Jerusalem")
+_ISRAEL_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# 2: timestamps stored as epoch seconds (1 used ISO-8601 strings).
+_STATE_SCHEMA_VERSION = 2
+
+# Coalesce bursts of state changes into one write.
+_PERSIST_DEBOUNCE_SECONDS = 0.5
+
+# fdatasync skips the metadata flush; not every platform has it.
+_fdatasync = getattr(os, "fdatasync", os.fsync)
 
 
 def utc_now() -> datetime:
@@ -32,14 +53,15 @@ def compute_next_run(provider_config: ProviderConfig, success_at: datetime) -> d
     success_at = _ensure_utc(success_at)
 
     if provider_config.reset_mode == ResetMode.ROLLING:
-        return success_at + timedelta(
-            seconds=provider_config.window_seconds + provider_config.wake_delay_seconds
-        )
+        return success_at + provider_config.rolling_interval
 
     if provider_config.reset_mode == ResetMode.CLOCK_ALIGNED_HOUR:
-        anchor = success_at.replace(minute=0, second=0, microsecond=0)
-        return anchor + timedelta(
-            seconds=provider_config.window_seconds + provider_config.wake_delay_seconds
+        # Floor to the hour in epoch seconds; cheaper than datetime.replace().
+        timestamp = int(success_at.timestamp())
+        anchor = timestamp - timestamp % 3600
+        return datetime.fromtimestamp(
+            anchor + provider_config.window_seconds + provider_config.wake_delay_seconds,
+            tz=timezone.utc,
         )
 
     raise ValueError(f"Unsupported reset mode: {provider_config.reset_mode!r}")
@@ -51,10 +73,7 @@ def compute_next_weekly_run(
 ) -> datetime:
     """Compute the next weekly wake-up timestamp after a successful wake-up."""
     success_at = _ensure_utc(success_at)
-    return success_at + timedelta(
-        seconds=provider_config.weekly_window_seconds
-        + provider_config.weekly_wake_delay_seconds
-    )
+    return success_at + provider_config.weekly_interval
 
 
 def parse_duration_seconds(text: str | None) -> int | None:
@@ -63,21 +82,8 @@ def parse_duration_seconds(text: str | None) -> int | None:
         return None
 
     total = 0
-    matches = list(_DURATION_PART_RE.finditer(text))
-    if not matches:
-        return None
-
-    for match in matches:
-        value = int(match.group("value"))
-        unit = match.group("unit").lower()
-        if unit.startswith("day"):
-            total += value * 24 * 60 * 60
-        elif unit.startswith("hour"):
-            total += value * 60 * 60
-        elif unit.startswith("minute"):
-            total += value * 60
-        else:
-            total += value
+    for value, unit in _DURATION_PART_RE.findall(text.lower()):
+        total += int(value) * _UNIT_SECONDS[unit]
 
     return total if total > 0 else None
 
@@ -85,26 +91,76 @@ def parse_duration_seconds(text: str | None) -> int | None:
 def format_time(value: datetime | None) -> str:
     if value is None:
         return "-"
-    return _ensure_utc(value).strftime("%Y-%m-%d %H:%M:%SZ")
+    return _format_epoch(int(_ensure_utc(value).timestamp()))
+
+
+def _format_israel_time(value: datetime | None) -> str:
+    if value is None:
+        return "-"
+    return _format_israel_epoch(int(_ensure_utc(value).timestamp()))
+
+
+@functools.lru_cache(maxsize=512)
+def _format_israel_epoch(timestamp: int) -> str:
+    return datetime.fromtimestamp(timestamp, _ISRAEL_TZ).strftime(_ISRAEL_TIME_FORMAT)
+
+
+@functools.lru_cache(maxsize=512)
+def _format_epoch(timestamp: int) -> str:
+    # Schedule times repeat across notifications; cache the rendered string.
+    return time.strftime("%Y-%m-%d %H:%M:%SZ", time.gmtime(timestamp))
 
 
 def _ensure_utc(value: datetime) -> datetime:
-    if value.tzinfo is None:
+    tz = value.tzinfo
+    if tz is timezone.utc:
+        # The common case: everything built by utc_now() is already UTC.
+        return value
+    if tz is None:
         return value.replace(tzinfo=timezone.utc)
     return value.astimezone(timezone.utc)
 
 
-def _serialize_time(value: datetime | None) -> str | None:
-    return _ensure_utc(value).isoformat() if value is not None else None
+def _serialize_time(value: datetime | None) -> int | None:
+    """Encode a timestamp as whole epoch seconds for the state file."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
 
 
-def _parse_time(value: str | None) -> datetime | None:
+def _parse_time(value: int | float | str | None) -> datetime | None:
     if value is None:
         return None
-    return _ensure_utc(datetime.fromisoformat(value))
+    if isinstance(value, str):
+        # schema_version 1 stored ISO-8601 strings.
+        return _ensure_utc(datetime.fromisoformat(value))
+    return datetime.fromtimestamp(value, tz=timezone.utc)
+
+
+def _write_synced(path: Path, data: bytes) -> None:
+    """Write ``data`` to ``path`` and flush it to disk before returning.
+
+    Callers rename the file into place afterwards; syncing first keeps a crash
+    from leaving an empty file behind the rename.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        _fdatasync(fd)
+    finally:
+        os.close(fd)
+
+
+def _resolve_waiter(waiter: asyncio.Future[None]) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
 
 
-@dataclass
+@dataclass(slots=True)
 class ProviderScheduleState:
     next_run_at: datetime
     weekly_next_run_at: datetime | None = None
@@ -115,6 +171,23 @@ class ProviderScheduleState:
     backoff_until: datetime | None = None
     auth_request_sent: bool = False
 
+    def copy(self) -> ProviderScheduleState:
+        """Return a detached copy.
+
+        Passes the fields positionally, which is about twice as fast as
+        dataclasses.replace(); keep the order in sync with the fields above.
+        """
+        return ProviderScheduleState(
+            self.next_run_at,
+            self.weekly_next_run_at,
+            self.last_success_at,
+            self.last_attempt_at,
+            self.consecutive_failures,
+            self.paused_reason,
+            self.backoff_until,
+            self.auth_request_sent,
+        )
+
 
 class WakeupScheduler:
     """Coordinates provider wake-up requests according to policy."""
@@ -128,15 +201,31 @@ class WakeupScheduler:
     ) -> None:
         self._config = config
         self._providers = providers
+        # The provider set is fixed for the scheduler's lifetime.
+        self._sorted_provider_names = tuple(sorted(providers))
+        # Working copy so configs can be reloaded; AppConfig.providers is read-only.
+        self._provider_configs: dict[str, ProviderConfig] = dict(config.providers)
         self._notify = notify
         self._request_auth = request_auth
 
         self._state_path = Path(config.scheduler.state_path)
         self._states: dict[str, ProviderScheduleState] = {}
+        # Serialized per-provider payloads, refreshed only for the provider that changed.
+        self._state_cache: dict[str, dict[str, Any]] = {}
         self._tasks: dict[str, asyncio.Task[None]] = {}
         self._provider_locks = {name: asyncio.Lock() for name in providers}
-        self._state_lock = asyncio.Lock()
+        self._dirty = asyncio.Event()
+        self._write_lock = threading.Lock()
+        # Bytes currently on disk, as far as we know; guarded by _write_lock.
+        self._last_written: bytes | None = None
+        # Payloads are numbered as they are taken; the worker thread drops any
+        # older than the newest already written (guarded by _write_lock).
+        self._write_seq = 0
+        self._written_seq = 0
+        self._persist_task: asyncio.Task[None] | None = None
         self._stop_event = asyncio.Event()
+        self._sleepers: set[asyncio.Future[None]] = set()
+        self._background_tasks: set[asyncio.Task[None]] = set()
         self._started = False
 
     async def start(self) -> None:
@@ -153,7 +242,7 @@ class WakeupScheduler:
             if state is None:
                 state = self._default_state(name, reference_time=now)
             else:
-                provider_config = self._config.providers[name]
+                provider_config = self._provider_configs[name]
                 if state.weekly_next_run_at is None:
                     reference = state.last_success_at or now
                     state.weekly_next_run_at = compute_next_weekly_run(
@@ -180,10 +269,14 @@ class WakeupScheduler:
                     if state.weekly_next_run_at is None:
                         state.weekly_next_run_at = configured_weekly_next
             self._states[name] = state
-            self._tasks[name] = asyncio.create_task(self._provider_loop(name))
+            self._state_cache[name] = self._snapshot_provider(name)
 
         self._started = True
+        # Write the recovered state before any worker gets a chance to change it.
         await self._persist_state()
+        for name in self._providers:
+            self._tasks[name] = asyncio.create_task(self._provider_loop(name))
+        self._persist_task = asyncio.create_task(self._persist_loop())
         logger.info("Scheduler started with providers: %s", ", ".join(self._providers))
 
     async def stop(self) -> None:
@@ -192,6 +285,8 @@ class WakeupScheduler:
             return
 
         self._stop_event.set()
+        for waiter in self._sleepers:
+            _resolve_waiter(waiter)
 
         for task in self._tasks.values():
             task.cancel()
@@ -199,27 +294,27 @@ class WakeupScheduler:
             await asyncio.gather(*self._tasks.values(), return_exceptions=True)
 
         self._tasks.clear()
-        await self._persist_state()
+        for task in self._background_tasks:
+            task.cancel()
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        if self._persist_task is not None:
+            self._persist_task.cancel()
+            await asyncio.gather(self._persist_task, return_exceptions=True)
+            self._persist_task = None
+        self._dirty.clear()
+        # Let the final flush finish even if shutdown cancels us mid-write.
+        await asyncio.shield(self._persist_state())
         self._started = False
         logger.info("Scheduler stopped")
 
     def format_status(self) -> str:
         """Render a human-readable scheduler snapshot for Telegram."""
-        from zoneinfo import ZoneInfo
-        _ISRAEL_TZ = ZoneInfo("Asia/Jerusalem")
-
-        # Format times in Israel timezone
-        def format_il_time(dt: datetime | None) -> str:
-            if dt is None:
-                return "-"
-            utc_dt = _ensure_utc(dt)
-            il_dt = utc_dt.astimezone(_ISRAEL_TZ)
-            return il_dt.strftime("%Y-%m-%d %H:%M:%S")
-
         lines = ["<b>📅 Schedule Status</b>\n"]
 
-        for name in sorted(self._providers):
-            state = self._states.get(name)
+        states = self._states
+        for name in self._sorted_provider_names:
+            state = states.get(name)
             if state is None:
                 lines.append(f"\n<b>{name}:</b> not initialized")
                 continue
@@ -228,17 +323,15 @@ class WakeupScheduler:
             if state.paused_reason == "auth_required":
                 status = "🔐 auth required"
 
-            lines.append(f"\n<b>┌─ {name.upper()}</b> [{status}]")
-
-            next_5h = format_il_time(state.next_run_at)
-            next_7d = format_il_time(state.weekly_next_run_at)
-            last_ok = format_il_time(state.last_success_at)
-
-            lines.append(f"│  <b>Next 5h:</b> {next_5h}")
-            lines.append(f"│  <b>Next 7d:</b> {next_7d}")
-            lines.append(f"│  <b>Last OK:</b> {last_ok}")
-            lines.append(f"│  <b>Failures:</b> {state.consecutive_failures}")
-            lines.append(f"└─────────────────")
+            # One string per provider block instead of one per line.
+            lines.append(
+                f"\n<b>┌─ {name.upper()}</b> [{status}]\n"
+                f"│  <b>Next 5h:</b> {_format_israel_time(state.next_run_at)}\n"
+                f"│  <b>Next 7d:</b> {_format_israel_time(state.weekly_next_run_at)}\n"
+                f"│  <b>Last OK:</b> {_format_israel_time(state.last_success_at)}\n"
+                f"│  <b>Failures:</b> {state.consecutive_failures}\n"
+                "└─────────────────"
+            )
 
         lines.append("\n<i>All times in Israel Time (Asia/Jerusalem)</i>")
 
@@ -247,7 +340,7 @@ class WakeupScheduler:
     def get_state(self, provider_name: str) -> ProviderScheduleState | None:
         """Return a copy of in-memory schedule state for one provider."""
         state = self._states.get(provider_name)
-        return replace(state) if state is not None else None
+        return state.copy() if state is not None else None
 
     def reload_provider_config(
         self,
@@ -257,8 +350,7 @@ class WakeupScheduler:
         """Reload one provider config in-memory without restarting the process."""
         if provider_name not in self._providers:
             return False
-        # AppConfig is frozen, but the providers mapping remains mutable.
-        self._config.providers[provider_name] = provider_config
+        self._provider_configs[provider_name] = provider_config
         return True
 
     async def trigger_wakeup(self, provider_name: str) -> WakeupResult | None:
@@ -294,12 +386,12 @@ class WakeupScheduler:
             state.next_run_at = scheduled
             if state.weekly_next_run_at is None:
                 state.weekly_next_run_at = compute_next_weekly_run(
-                    self._config.providers[provider_name],
+                    self._provider_configs[provider_name],
                     state.last_success_at or utc_now(),
                 )
             state.backoff_until = None
             state.paused_reason = None
-            await self._persist_state()
+            self._mark_dirty(provider_name)
 
         await self._restart_provider_worker(provider_name)
         return self.get_state(provider_name)
@@ -325,29 +417,25 @@ class WakeupScheduler:
             state.weekly_next_run_at = scheduled
             if state.next_run_at is None:
                 state.next_run_at = compute_next_run(
-                    self._config.providers[provider_name],
+                    self._provider_configs[provider_name],
                     state.last_success_at or utc_now(),
                 )
             state.backoff_until = None
             state.paused_reason = None
-            await self._persist_state()
+            self._mark_dirty(provider_name)
 
         await self._restart_provider_worker(provider_name)
         return self.get_state(provider_name)
 
     async def _provider_loop(self, provider_name: str) -> None:
-        provider = self._providers[provider_name]
-
         while not self._stop_event.is_set():
             try:
                 state = self._states[provider_name]
-                now = utc_now()
+                due_at = state.next_run_at
+                if state.weekly_next_run_at is not None and state.weekly_next_run_at < due_at:
+                    due_at = state.weekly_next_run_at
 
-                primary_delay = (state.next_run_at - now).total_seconds()
-                weekly_delay = float("inf")
-                if state.weekly_next_run_at is not None:
-                    weekly_delay = (state.weekly_next_run_at - now).total_seconds()
-                delay_seconds = min(primary_delay, weekly_delay)
+                delay_seconds = (due_at - utc_now()).total_seconds()
                 if delay_seconds > 0:
                     await self._sleep_or_stop(delay_seconds)
                     continue
@@ -366,7 +454,7 @@ class WakeupScheduler:
         triggered_by_user: bool,
     ) -> WakeupResult:
         provider = self._providers[provider_name]
-        provider_config = self._config.providers[provider_name]
+        provider_config = self._provider_configs[provider_name]
 
         async with self._provider_locks[provider_name]:
             state = self._states[provider_name]
@@ -416,7 +504,7 @@ class WakeupScheduler:
                     state.next_run_at = compute_next_run(provider_config, now)
                 if due_weekly:
                     state.weekly_next_run_at = compute_next_weekly_run(provider_config, now)
-                await self._persist_state()
+                self._mark_dirty(provider_name)
 
                 if triggered_by_user or had_recovery:
                     await self._safe_notify(
@@ -440,31 +528,21 @@ class WakeupScheduler:
                 state.paused_reason = "auth_required"
                 state.consecutive_failures += 1
                 state.backoff_until = None
-                state.next_run_at = now + timedelta(
-                    seconds=provider_config.window_seconds
-                    + provider_config.wake_delay_seconds
-                )
-                state.weekly_next_run_at = now + timedelta(
-                    seconds=provider_config.weekly_window_seconds
-                    + provider_config.weekly_wake_delay_seconds
-                )
-                await self._persist_state()
+                state.next_run_at = now + provider_config.rolling_interval
+                state.weekly_next_run_at = now + provider_config.weekly_interval
+                first_auth_request = not state.auth_request_sent
+                state.auth_request_sent = True
+                self._mark_dirty(provider_name)
 
-                if not state.auth_request_sent:
-                    state.auth_request_sent = True
-                    await self._persist_state()
+                if first_auth_request:
                     await self._safe_notify(
                         f"{provider.name}: authentication required. "
                         "Automatic auth was triggered once; use /auth or manual CLI "
                         "login if needed."
                     )
-                    try:
-                        await self._request_auth(provider_name)
-                    except Exception:
-                        logger.exception(
-                            "Failed to trigger device auth for provider %s",
-                            provider_name,
-                        )
+                    # The device-code flow can take a while to print its code;
+                    # don't hold the provider lock for it.
+                    self._spawn(self._safe_request_auth(provider_name))
                 return result
 
             if kind == WakeupFailureKind.RATE_LIMIT:
@@ -487,7 +565,7 @@ class WakeupScheduler:
                 state.weekly_next_run_at = now + timedelta(
                     seconds=reset_seconds + provider_config.weekly_wake_delay_seconds
                 )
-                await self._persist_state()
+                self._mark_dirty(provider_name)
 
                 if triggered_by_user:
                     await self._safe_notify(
@@ -502,15 +580,20 @@ class WakeupScheduler:
                 provider_name,
                 result.message[:200],
             )
-            backoff_seconds = min(
-                self._config.scheduler.retry_base_seconds
-                * (2 ** (state.consecutive_failures - 1)),
-                self._config.scheduler.retry_max_seconds,
-            )
+            scheduler_config = self._config.scheduler
+            doublings = state.consecutive_failures - 1
+            # Past 30 doublings any sane cap has long been reached; skip the bignum.
+            if doublings < 30:
+                backoff_seconds = min(
+                    scheduler_config.retry_base_seconds << doublings,
+                    scheduler_config.retry_max_seconds,
+                )
+            else:
+                backoff_seconds = scheduler_config.retry_max_seconds
             state.backoff_until = now + timedelta(seconds=backoff_seconds)
             state.next_run_at = state.backoff_until
             state.weekly_next_run_at = state.backoff_until
-            await self._persist_state()
+            self._mark_dirty(provider_name)
 
             if triggered_by_user or state.consecutive_failures in (1, 3, 5):
                 await self._safe_notify(
@@ -519,13 +602,50 @@ class WakeupScheduler:
                 )
             return result
 
+    def _mark_dirty(self, provider_name: str) -> None:
+        """Re-snapshot one provider and request a coalesced state write.
+
+        Nothing is written when the snapshot matches what is already cached.
+        """
+        snapshot = self._snapshot_provider(provider_name)
+        if self._state_cache.get(provider_name) == snapshot:
+            return
+        self._state_cache[provider_name] = snapshot
+        self._dirty.set()
+
+    def _snapshot_provider(self, provider_name: str) -> dict[str, Any]:
+        state = self._states[provider_name]
+        return {
+            "next_run_at": _serialize_time(state.next_run_at),
+            "weekly_next_run_at": _serialize_time(state.weekly_next_run_at),
+            "last_success_at": _serialize_time(state.last_success_at),
+            "last_attempt_at": _serialize_time(state.last_attempt_at),
+            "consecutive_failures": state.consecutive_failures,
+            "paused_reason": state.paused_reason,
+            "backoff_until": _serialize_time(state.backoff_until),
+            "auth_request_sent": state.auth_request_sent,
+        }
+
+    async def _persist_loop(self) -> None:
+        while True:
+            await self._dirty.wait()
+            await asyncio.sleep(_PERSIST_DEBOUNCE_SECONDS)
+            self._dirty.clear()
+            await self._persist_state()
+
     async def _sleep_or_stop(self, seconds: float) -> None:
-        if seconds <= 0:
+        if seconds <= 0 or self._stop_event.is_set():
             return
+        # A bare future plus a timer handle; stop() resolves pending sleepers.
+        loop = asyncio.get_running_loop()
+        waiter: asyncio.Future[None] = loop.create_future()
+        handle = loop.call_later(seconds, _resolve_waiter, waiter)
+        self._sleepers.add(waiter)
         try:
-            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
-        except asyncio.TimeoutError:
-            return
+            await waiter
+        finally:
+            handle.cancel()
+            self._sleepers.discard(waiter)
 
     async def _safe_notify(self, message: str) -> None:
         try:
@@ -533,6 +653,18 @@ class WakeupScheduler:
         except Exception:
             logger.exception("Failed to send scheduler notification")
 
+    async def _safe_request_auth(self, provider_name: str) -> None:
+        try:
+            await self._request_auth(provider_name)
+        except Exception:
+            logger.exception("Failed to trigger device auth for provider %s", provider_name)
+
+    def _spawn(self, coro: Coroutine[Any, Any, None]) -> None:
+        """Run ``coro`` in the background; stop() cancels whatever is left."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
     async def _restart_provider_worker(self, provider_name: str) -> None:
         """Restart one worker loop so state changes take effect immediately."""
         if not self._started or self._stop_event.is_set():
@@ -550,7 +682,7 @@ class WakeupScheduler:
         reference_time: datetime | None = None,
     ) -> ProviderScheduleState:
         now = utc_now() if reference_time is None else _ensure_utc(reference_time)
-        provider_config = self._config.providers[provider_name]
+        provider_config = self._provider_configs[provider_name]
         return ProviderScheduleState(
             next_run_at=now + timedelta(seconds=provider_config.wake_delay_seconds),
             weekly_next_run_at=now
@@ -562,8 +694,9 @@ class WakeupScheduler:
             return {}
 
         try:
-            payload = json.loads(self._state_path.read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError):
+            raw = self._state_path.read_bytes()
+            payload = jsonutil.loads(raw)
+        except (OSError, ValueError):
             logger.warning(
                 "Could not read scheduler state from %s, using defaults",
                 self._state_path,
@@ -574,62 +707,67 @@ class WakeupScheduler:
         if not isinstance(providers_payload, dict):
             logger.warning("Scheduler state format invalid, using defaults")
             return {}
+        self._last_written = raw
 
         loaded: dict[str, ProviderScheduleState] = {}
+        providers = self._providers
         for name, state_data in providers_payload.items():
-            if name not in self._providers:
+            if name not in providers:
                 continue
             if not isinstance(state_data, dict):
                 continue
 
+            get = state_data.get
             try:
-                next_run_at = _parse_time(state_data.get("next_run_at"))
+                next_run_at = _parse_time(get("next_run_at"))
                 if next_run_at is None:
                     raise ValueError("next_run_at is required")
 
                 loaded[name] = ProviderScheduleState(
                     next_run_at=next_run_at,
-                    weekly_next_run_at=_parse_time(state_data.get("weekly_next_run_at")),
-                    last_success_at=_parse_time(state_data.get("last_success_at")),
-                    last_attempt_at=_parse_time(state_data.get("last_attempt_at")),
-                    consecutive_failures=int(state_data.get("consecutive_failures", 0)),
-                    paused_reason=state_data.get("paused_reason"),
-                    backoff_until=_parse_time(state_data.get("backoff_until")),
-                    auth_request_sent=bool(state_data.get("auth_request_sent", False)),
+                    weekly_next_run_at=_parse_time(get("weekly_next_run_at")),
+                    last_success_at=_parse_time(get("last_success_at")),
+                    last_attempt_at=_parse_time(get("last_attempt_at")),
+                    consecutive_failures=int(get("consecutive_failures", 0)),
+                    paused_reason=get("paused_reason"),
+                    backoff_until=_parse_time(get("backoff_until")),
+                    auth_request_sent=bool(get("auth_request_sent", False)),
                 )
-            except (TypeError, ValueError):
+            except (TypeError, ValueError, OverflowError, OSError):
                 logger.warning("Invalid scheduler state for provider %s, using default", name)
 
         return loaded
 
     async def _persist_state(self) -> None:
-        async with self._state_lock:
-            payload = {
-                "schema_version": 1,
-                "providers": {
-                    name: {
-                        "next_run_at": _serialize_time(state.next_run_at),
-                        "weekly_next_run_at": _serialize_time(state.weekly_next_run_at),
-                        "last_success_at": _serialize_time(state.last_success_at),
-                        "last_attempt_at": _serialize_time(state.last_attempt_at),
-                        "consecutive_failures": state.consecutive_failures,
-                        "paused_reason": state.paused_reason,
-                        "backoff_until": _serialize_time(state.backoff_until),
-                        "auth_request_sent": state.auth_request_sent,
-                    }
-                    for name, state in self._states.items()
-                },
-            }
-
+        """Write the cached provider snapshots to the state file.
+
+        Encoding and file I/O run in a worker thread so they do not stall the
+        event loop. Cancelling the caller does not stop that thread, so each
+        payload carries a sequence number and a stale one never overwrites a
+        newer write (e.g. stop()'s final flush).
+        """
+        # Copy the mapping in one synchronous step; entries are replaced, never mutated.
+        payload = {"schema_version": _STATE_SCHEMA_VERSION, "providers": dict(self._state_cache)}
+        self._write_seq += 1
+        await asyncio.to_thread(self._write_state_file, payload, self._write_seq)
+
+    def _write_state_file(self, payload: dict[str, Any], seq: int) -> None:
+        data = jsonutil.dumps(payload)
+        # A cancelled persist leaves its thread running; stop()'s final write
+        # must not interleave with it on the shared temp file.
+        with self._write_lock:
+            if seq < self._written_seq:
+                return
+            self._written_seq = seq
+            if data == self._last_written:
+                return
             try:
                 self._state_path.parent.mkdir(parents=True, exist_ok=True)
-                tmp_path = self._state_path.with_suffix(
-                    f"{self._state_path.suffix}.tmp"
-                )
-                tmp_path.write_text(
-                    json.dumps(payload, indent=2, sort_keys=True),
-                    encoding="utf-8",
-                )
+                tmp_path = self._state_path.with_suffix(f"{self._state_path.suffix}.tmp")
+                _write_synced(tmp_path, data)
                 os.replace(tmp_path, self._state_path)
+                self._last_written = data
             except OSError:
-                logger.exception("Failed to persist scheduler state to %s", self._state_path)
+                logger.exception(
+                    "Failed to persist scheduler state to %s", self._state_path
+                )
@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from collections.abc import AsyncIterator, Callable, Mapping
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
+from aiogram.exceptions import TelegramRetryAfter
 
-from src.bot import TelegramBot
+from src.bot import TelegramBot, _parse_hh_mm
 from src.config import (
     AppConfig,
     ProviderConfig,
@@ -15,7 +18,7 @@ from src.config import (
     SchedulerConfig,
     TelegramConfig,
 )
-from src.providers.base import WakeupFailureKind, WakeupResult
+from src.providers.base import AuthStatus, DeviceCodeInfo, WakeupFailureKind, WakeupResult
 from src.scheduler import ProviderScheduleState
 
 
@@ -67,43 +70,118 @@ class DummyScheduler:
         return self._state
 
 
-def _build_config(tmp_path: Path) -> AppConfig:
+class DummyProvider:
+    def __init__(self, name: str, status: AuthStatus | Exception) -> None:
+        self._name = name
+        self._status = status
+        self.check_calls = 0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def check_auth(self) -> AuthStatus:
+        self.check_calls += 1
+        if isinstance(self._status, Exception):
+            raise self._status
+        return self._status
+
+
+def _codex_providers() -> dict[str, DummyProvider]:
+    return {"codex": DummyProvider("Codex", AuthStatus.OK)}
+
+
+_TELEGRAM_CFG = TelegramConfig(bot_token="12345:test", chat_id="1")
+_CODEX_PROVIDER_CFG = ProviderConfig(
+    name="codex",
+    model="gpt-5.4",
+    wakeup_message="say hi",
+    reset_mode=ResetMode.ROLLING,
+    window_seconds=18000,
+    wake_delay_seconds=10,
+    weekly_window_seconds=604800,
+    weekly_wake_delay_seconds=10,
+)
+
+
+def _build_config(
+    tmp_path: Path,
+    providers: Mapping[str, ProviderConfig] | None = None,
+) -> AppConfig:
     return AppConfig(
-        telegram=TelegramConfig(bot_token="12345:test", chat_id="1"),
+        telegram=_TELEGRAM_CFG,
         scheduler=SchedulerConfig(
             state_path=str(tmp_path / "scheduler_state.json"),
             auth_recheck_seconds=60,
             retry_base_seconds=60,
             retry_max_seconds=3600,
         ),
-        providers={},
+        providers={} if providers is None else providers,
     )
 
 
-@pytest.mark.asyncio
-async def test_get_schedule_text_without_scheduler(tmp_path: Path) -> None:
-    bot = TelegramBot(_build_config(tmp_path), {})
-    try:
-        assert await bot.get_schedule_text() == "Scheduler is not initialized yet."
-    finally:
-        await bot.stop()
+@pytest.fixture(scope="module")
+def refreshed_config(tmp_path_factory: pytest.TempPathFactory) -> AppConfig:
+    """Config returned by the patched ``load_config_cached`` with codex enabled."""
+    return _build_config(
+        tmp_path_factory.mktemp("refreshed"), {"codex": _CODEX_PROVIDER_CFG}
+    )
+
+
+@pytest.fixture()
+def patch_load_config(
+    monkeypatch: pytest.MonkeyPatch, refreshed_config: AppConfig
+) -> None:
+    monkeypatch.setattr("src.bot.load_config_cached", lambda: refreshed_config)
+
+
+@pytest.fixture(scope="module")
+async def shared_bot(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> AsyncIterator[TelegramBot]:
+    """One bot per module: each new bot's HTTP session reloads the CA bundle."""
+    bot = TelegramBot(_build_config(tmp_path_factory.mktemp("bot")), {})
+    yield bot
+    await bot.stop()
+
+
+@pytest.fixture()
+async def make_bot(
+    shared_bot: TelegramBot,
+) -> AsyncIterator[Callable[[Mapping[str, object]], TelegramBot]]:
+    """Hand out the shared bot with the given providers and reset it afterwards.
+
+    Tests must patch bot attributes through ``monkeypatch`` so they are undone.
+    """
+
+    def _make(providers: Mapping[str, object]) -> TelegramBot:
+        shared_bot._providers = providers  # type: ignore[assignment]
+        return shared_bot
+
+    yield _make
+    for task in shared_bot._pending_auth.values():
+        task.cancel()
+    shared_bot._pending_auth.clear()
+    shared_bot._auth_cache.clear()
+    shared_bot._scheduler = None
+    shared_bot._providers = {}
 
 
-@pytest.mark.asyncio
-async def test_get_schedule_text_with_scheduler(tmp_path: Path) -> None:
-    bot = TelegramBot(_build_config(tmp_path), {})
+async def test_get_schedule_text_without_scheduler(make_bot) -> None:
+    bot = make_bot({})
+    assert await bot.get_schedule_text() == "Scheduler is not initialized yet."
+
+
+async def test_get_schedule_text_with_scheduler(make_bot) -> None:
+    bot = make_bot({})
     scheduler = DummyScheduler(result=None, state=None, status_text="scheduler ok")
     bot.set_scheduler(scheduler)  # type: ignore[arg-type]
 
-    try:
-        assert await bot.get_schedule_text() == "scheduler ok"
-    finally:
-        await bot.stop()
+    assert await bot.get_schedule_text() == "scheduler ok"
 
 
-@pytest.mark.asyncio
-async def test_run_manual_wake_success(tmp_path: Path) -> None:
-    bot = TelegramBot(_build_config(tmp_path), {})
+async def test_run_manual_wake_success(make_bot) -> None:
+    bot = make_bot(_codex_providers())
     scheduler = DummyScheduler(
         result=WakeupResult(success=True, message="OK"),
         state=ProviderScheduleState(next_run_at=datetime(2026, 2, 10, tzinfo=timezone.utc)),
@@ -111,18 +189,14 @@ async def test_run_manual_wake_success(tmp_path: Path) -> None:
     )
     bot.set_scheduler(scheduler)  # type: ignore[arg-type]
 
-    try:
-        text = await bot.run_manual_wake("codex")
-        assert "wake-up succeeded" in text
-        assert "Next run:" in text
-        assert scheduler.last_triggered == "codex"
-    finally:
-        await bot.stop()
+    text = await bot.run_manual_wake("codex")
+    assert "wake-up succeeded" in text
+    assert "Next run:" in text
+    assert scheduler.last_triggered == "codex"
 
 
-@pytest.mark.asyncio
-async def test_run_manual_wake_failure(tmp_path: Path) -> None:
-    bot = TelegramBot(_build_config(tmp_path), {})
+async def test_run_manual_wake_failure(make_bot) -> None:
+    bot = make_bot(_codex_providers())
     scheduler = DummyScheduler(
         result=WakeupResult(
             success=False,
@@ -134,72 +208,41 @@ async def test_run_manual_wake_failure(tmp_path: Path) -> None:
     )
     bot.set_scheduler(scheduler)  # type: ignore[arg-type]
 
-    try:
-        text = await bot.run_manual_wake("codex")
-        assert "wake-up failed (rate_limit)" in text
-        assert "Message: rate limit" in text
-    finally:
-        await bot.stop()
+    text = await bot.run_manual_wake("codex")
+    assert "wake-up failed (rate_limit)" in text
+    assert "Message: rate limit" in text
 
 
-@pytest.mark.asyncio
-async def test_run_manual_wake_unknown_provider(tmp_path: Path) -> None:
-    bot = TelegramBot(_build_config(tmp_path), {})
+async def test_run_manual_wake_unknown_provider(make_bot) -> None:
+    bot = make_bot({})
     scheduler = DummyScheduler(result=None, state=None, status_text="status")
     bot.set_scheduler(scheduler)  # type: ignore[arg-type]
 
-    try:
-        text = await bot.run_manual_wake("unknown")
-        assert text == "Unknown provider: unknown"
-    finally:
-        await bot.stop()
+    text = await bot.run_manual_wake("unknown")
+    assert text == "Unknown provider: unknown"
 
 
-@pytest.mark.asyncio
-async def test_schedule_wake_at_israel_time_success(tmp_path: Path) -> None:
-    bot = TelegramBot(_build_config(tmp_path), {})
+@pytest.mark.usefixtures("patch_load_config")
+async def test_schedule_wake_at_israel_time_success(
+    make_bot, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    bot = make_bot(_codex_providers())
     state = ProviderScheduleState(next_run_at=datetime(2026, 2, 10, tzinfo=timezone.utc))
     scheduler = DummyScheduler(result=None, state=state, status_text="status")
     bot.set_scheduler(scheduler)  # type: ignore[arg-type]
 
-    provider_cfg = ProviderConfig(
-        name="codex",
-        model="gpt-5.4",
-        wakeup_message="say hi",
-        reset_mode=ResetMode.ROLLING,
-        window_seconds=18000,
-        wake_delay_seconds=10,
-        weekly_window_seconds=604800,
-        weekly_wake_delay_seconds=10,
-    )
-    refreshed_config = AppConfig(
-        telegram=TelegramConfig(bot_token="12345:test", chat_id="1"),
-        scheduler=SchedulerConfig(
-            state_path=str(tmp_path / "scheduler_state.json"),
-            auth_recheck_seconds=60,
-            retry_base_seconds=60,
-            retry_max_seconds=3600,
-        ),
-        providers={"codex": provider_cfg},
-    )
-
     target = datetime(2026, 2, 10, 10, 0, tzinfo=timezone.utc)
-    bot._next_israel_occurrence = lambda _text: (target, False)  # type: ignore[assignment]
-
-    try:
-        with pytest.MonkeyPatch.context() as mp:
-            mp.setattr("src.bot.load_config", lambda: refreshed_config)
-            text = await bot.schedule_wake_at_israel_time("codex", "12:00")
-        assert "next reset scheduled" in text
-        assert scheduler.last_scheduled == "codex"
-        assert scheduler.last_scheduled_at == target
-    finally:
-        await bot.stop()
-
-
-@pytest.mark.asyncio
-async def test_schedule_wake_at_israel_time_invalid_format(tmp_path: Path) -> None:
-    bot = TelegramBot(_build_config(tmp_path), {})
+    monkeypatch.setattr(bot, "_next_israel_occurrence", lambda _text: (target, False))
+
+    text = await bot.schedule_wake_at_israel_time("codex", "12:00")
+    assert "next reset scheduled" in text
+    assert scheduler.last_scheduled == "codex"
+    assert scheduler.last_scheduled_at == target
+
+
+@pytest.mark.usefixtures("patch_load_config")
+async def test_schedule_wake_at_israel_time_invalid_format(make_bot) -> None:
+    bot = make_bot(_codex_providers())
     scheduler = DummyScheduler(
         result=None,
         state=ProviderScheduleState(next_run_at=datetime(2026, 2, 10, tzinfo=timezone.utc)),
@@ -207,31 +250,121 @@ async def test_schedule_wake_at_israel_time_invalid_format(tmp_path: Path) -> No
     )
     bot.set_scheduler(scheduler)  # type: ignore[arg-type]
 
-    provider_cfg = ProviderConfig(
-        name="codex",
-        model="gpt-5.4",
-        wakeup_message="say hi",
-        reset_mode=ResetMode.ROLLING,
-        window_seconds=18000,
-        wake_delay_seconds=10,
-        weekly_window_seconds=604800,
-        weekly_wake_delay_seconds=10,
-    )
-    refreshed_config = AppConfig(
-        telegram=TelegramConfig(bot_token="12345:test", chat_id="1"),
-        scheduler=SchedulerConfig(
-            state_path=str(tmp_path / "scheduler_state.json"),
-            auth_recheck_seconds=60,
-            retry_base_seconds=60,
-            retry_max_seconds=3600,
-        ),
-        providers={"codex": provider_cfg},
-    )
+    text = await bot.schedule_wake_at_israel_time("codex", "99:99")
+    assert "Invalid time format" in text
+
+
+async def test_check_all_auth_maps_exceptions_to_error(make_bot) -> None:
+    providers = {
+        "claude": DummyProvider("Claude", AuthStatus.OK),
+        "codex": DummyProvider("Codex", RuntimeError("boom")),
+    }
+    bot = make_bot(providers)
+
+    results = await bot.check_all_auth()
+    assert results == {"claude": AuthStatus.OK, "codex": AuthStatus.ERROR}
+    assert list(results) == ["claude", "codex"]
+
+
+async def test_check_all_auth_reuses_recent_results(make_bot) -> None:
+    provider = DummyProvider("Codex", AuthStatus.OK)
+    bot = make_bot({"codex": provider})
+
+    await bot.check_all_auth()
+    await bot.check_all_auth()
+    assert provider.check_calls == 1
+
+
+async def test_check_all_auth_rechecks_non_ok_results(make_bot) -> None:
+    provider = DummyProvider("Codex", AuthStatus.NOT_AUTHENTICATED)
+    bot = make_bot({"codex": provider})
+
+    await bot.check_all_auth()
+    await bot.check_all_auth()
+    assert provider.check_calls == 2
+
+
+async def test_is_authorized_compares_chat_id_as_int(make_bot) -> None:
+    bot = make_bot({})
+
+    assert bot._is_authorized(SimpleNamespace(chat=SimpleNamespace(id=1)))  # type: ignore[arg-type]
+    assert not bot._is_authorized(SimpleNamespace(chat=SimpleNamespace(id=2)))  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("00:00", (0, 0)),
+        ("23:59", (23, 59)),
+        ("24:00", None),
+        ("12:60", None),
+        ("9:30", None),
+        ("12-30", None),
+        ("¹2:30", None),
+    ],
+)
+def test_parse_hh_mm(raw: str, expected: tuple[int, int] | None) -> None:
+    assert _parse_hh_mm(raw) == expected
+
+
+class DeviceAuthProvider(DummyProvider):
+    async def start_device_auth(self) -> DeviceCodeInfo | None:
+        return DeviceCodeInfo(code="ABCD-1234", url="https://example.com/device")
+
+    async def wait_for_device_auth(self) -> bool:
+        return True
+
+
+async def test_run_device_auth_releases_finished_task(make_bot, monkeypatch: pytest.MonkeyPatch) -> None:
+    provider = DeviceAuthProvider("Codex", AuthStatus.OK)
+    bot = make_bot({"codex": provider})
+    sent: list[str] = []
+
+    async def _send(text: str) -> None:
+        sent.append(text)
+
+    monkeypatch.setattr(bot, "send", _send)
+
+    await bot.run_device_auth("codex")
+    task = bot._pending_auth["codex"]
+    assert await task
+    assert "codex" not in bot._pending_auth
+    assert sent[-1] == "Codex authentication successful!"
+
+
+async def test_send_retries_after_telegram_rate_limit(make_bot, monkeypatch: pytest.MonkeyPatch) -> None:
+    bot = make_bot({})
+    delivered: list[str] = []
+    attempts = 0
+
+    async def _send_message(*, chat_id: str, text: str, parse_mode: str) -> None:
+        nonlocal attempts
+        del chat_id, parse_mode
+        attempts += 1
+        if attempts == 1:
+            raise TelegramRetryAfter(method=None, message="flood", retry_after=0)  # type: ignore[arg-type]
+        delivered.append(text)
+
+    monkeypatch.setattr(bot._bot, "send_message", _send_message)
+
+    await bot.send("first")
+    await bot.send("second")
+    await bot._tx_queue.join()
+    assert delivered == ["first", "second"]
+    assert attempts == 3
+
+
+async def test_schedule_wake_unknown_provider_skips_config_lookup(
+    make_bot, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    bot = make_bot(_codex_providers())
+    scheduler = DummyScheduler(result=None, state=None, status_text="status")
+    bot.set_scheduler(scheduler)  # type: ignore[arg-type]
+
+    def _fail() -> AppConfig:
+        raise AssertionError("config must not be read for unknown providers")
 
-    try:
-        with pytest.MonkeyPatch.context() as mp:
-            mp.setattr("src.bot.load_config", lambda: refreshed_config)
-            text = await bot.schedule_wake_at_israel_time("codex", "99:99")
-        assert "Invalid time format" in text
-    finally:
-        await bot.stop()
+    monkeypatch.setattr("src.bot.load_config_cached", _fail)
+    text = await bot.schedule_wake_at_israel_time("cladue", "12:00")
+    assert text == "Unknown provider: cladue"
+    assert scheduler.last_scheduled is None
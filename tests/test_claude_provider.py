@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Iterator
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -13,7 +14,28 @@ from src.providers.claude import ClaudeProvider
 from src.providers.subprocess import CLIResult
 
 
-@pytest.fixture()
+AUTH_OK_STDOUT = json.dumps({"is_error": False, "result": "hello"}).encode()
+AUTH_INVALID_KEY_STDOUT = json.dumps(
+    {"is_error": True, "result": "Invalid API key · Fix external API key"}
+).encode()
+AUTH_NOT_LOGGED_IN_STDOUT = json.dumps(
+    {"is_error": True, "result": "Not logged in · Please run /login"}
+).encode()
+WAKEUP_SUCCESS_STDOUT = json.dumps(
+    {"is_error": False, "result": "hi there!", "total_cost_usd": 0.01}
+).encode()
+WAKEUP_RATE_LIMITED_STDOUT = json.dumps(
+    {
+        "is_error": True,
+        "result": "Claude usage limit reached. Your limit will reset in 3 hours 42 minutes.",
+    }
+).encode()
+WAKEUP_INVALID_KEY_STDOUT = json.dumps(
+    {"is_error": True, "result": "Invalid API key"}
+).encode()
+
+
+@pytest.fixture(scope="module")
 def provider() -> ClaudeProvider:
     config = ProviderConfig(
         name="claude",
@@ -26,83 +48,89 @@ def provider() -> ClaudeProvider:
     return ClaudeProvider(config)
 
 
-# --- check_auth ---
+@pytest.fixture(scope="module")
+def run_cli_mock() -> Iterator[AsyncMock]:
+    """Patch ``run_cli`` once for the module; tests set ``return_value``."""
+    mock = AsyncMock()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("src.providers.claude.run_cli", mock)
+        yield mock
 
 
-@pytest.mark.asyncio
-async def test_check_auth_success(provider):
-    result = CLIResult(
-        returncode=0,
-        stdout=json.dumps({"is_error": False, "result": "hello"}),
-        stderr="",
-    )
-    with patch(
-        "src.providers.claude.run_cli", new_callable=AsyncMock, return_value=result
-    ):
-        status = await provider.check_auth()
-    assert status == AuthStatus.OK
+@pytest.fixture(autouse=True)
+def reset_provider(provider: ClaudeProvider, run_cli_mock: AsyncMock) -> None:
+    """Clear the per-flow state that the module-scoped fixtures carry over."""
+    run_cli_mock.reset_mock(return_value=True)
+    provider._device_auth_proc = None
+    provider._supports_device_auth = None
 
 
-@pytest.mark.asyncio
-async def test_check_auth_invalid_key(provider):
-    result = CLIResult(
-        returncode=0,
-        stdout=json.dumps(
-            {"is_error": True, "result": "Invalid API key · Fix external API key"}
-        ),
-        stderr="",
-    )
-    with patch(
-        "src.providers.claude.run_cli", new_callable=AsyncMock, return_value=result
-    ):
-        status = await provider.check_auth()
-    assert status == AuthStatus.NOT_AUTHENTICATED
-
-
-@pytest.mark.asyncio
-async def test_check_auth_timeout(provider):
-    result = CLIResult(returncode=-1, stdout="", stderr="Timed out after 30s")
-    with patch(
-        "src.providers.claude.run_cli", new_callable=AsyncMock, return_value=result
-    ):
-        status = await provider.check_auth()
-    assert status == AuthStatus.ERROR
+# --- check_auth ---
 
 
-@pytest.mark.asyncio
-async def test_check_auth_non_json_auth_error(provider):
-    result = CLIResult(returncode=1, stdout="please log in first", stderr="")
-    with patch(
-        "src.providers.claude.run_cli", new_callable=AsyncMock, return_value=result
-    ):
-        status = await provider.check_auth()
-    assert status == AuthStatus.NOT_AUTHENTICATED
+CHECK_AUTH_CASES = [
+    pytest.param(
+        CLIResult(
+            returncode=0,
+            stdout=AUTH_OK_STDOUT,
+            stderr="",
+        ),
+        AuthStatus.OK,
+        id="success",
+    ),
+    pytest.param(
+        CLIResult(
+            returncode=0,
+            stdout=AUTH_INVALID_KEY_STDOUT,
+            stderr="",
+        ),
+        AuthStatus.NOT_AUTHENTICATED,
+        id="invalid_key",
+    ),
+    pytest.param(
+        CLIResult(returncode=-1, stdout=b"", stderr="Timed out after 30s"),
+        AuthStatus.ERROR,
+        id="timeout",
+    ),
+    pytest.param(
+        CLIResult(returncode=1, stdout=b"please log in first", stderr=""),
+        AuthStatus.NOT_AUTHENTICATED,
+        id="non_json_auth_error",
+    ),
+    pytest.param(
+        CLIResult(returncode=1, stdout=b'  ["unauthorized"]\n', stderr=""),
+        AuthStatus.NOT_AUTHENTICATED,
+        id="non_object_json_falls_back_to_text",
+    ),
+    pytest.param(
+        CLIResult(
+            returncode=1,
+            stdout=AUTH_NOT_LOGGED_IN_STDOUT,
+            stderr="",
+        ),
+        AuthStatus.NOT_AUTHENTICATED,
+        id="not_logged_in_message",
+    ),
+]
 
 
-@pytest.mark.asyncio
-async def test_check_auth_not_logged_in_message(provider):
-    result = CLIResult(
-        returncode=1,
-        stdout=json.dumps({"is_error": True, "result": "Not logged in · Please run /login"}),
-        stderr="",
-    )
-    with patch(
-        "src.providers.claude.run_cli", new_callable=AsyncMock, return_value=result
-    ):
-        status = await provider.check_auth()
-    assert status == AuthStatus.NOT_AUTHENTICATED
+@pytest.mark.parametrize(("result", "expected"), CHECK_AUTH_CASES)
+async def test_check_auth(provider, run_cli_mock, result, expected):
+    run_cli_mock.return_value = result
+    status = await provider.check_auth()
+    assert status == expected
 
 
-@pytest.mark.asyncio
-async def test_start_device_auth_unsupported_in_current_cli(provider):
+async def test_start_device_auth_unsupported_in_current_cli(provider, run_cli_mock):
     help_result = CLIResult(
         returncode=0,
         stdout="Commands:\n  setup-token",
         stderr="",
     )
+    run_cli_mock.return_value = help_result
     with patch(
-        "src.providers.claude.run_cli", new_callable=AsyncMock, return_value=help_result
-    ), patch("src.providers.claude.start_long_running", new_callable=AsyncMock) as starter:
+        "src.providers.claude.start_long_running", new_callable=AsyncMock
+    ) as starter:
         info = await provider.start_device_auth()
     assert info is None
     starter.assert_not_called()
@@ -111,68 +139,60 @@ async def test_start_device_auth_unsupported_in_current_cli(provider):
 # --- send_wakeup ---
 
 
-@pytest.mark.asyncio
-async def test_send_wakeup_success(provider):
+async def test_send_wakeup_success(provider, run_cli_mock):
     result = CLIResult(
         returncode=0,
-        stdout=json.dumps(
-            {"is_error": False, "result": "hi there!", "total_cost_usd": 0.01}
-        ),
+        stdout=WAKEUP_SUCCESS_STDOUT,
         stderr="",
     )
-    with patch(
-        "src.providers.claude.run_cli", new_callable=AsyncMock, return_value=result
-    ):
-        wakeup = await provider.send_wakeup()
+    run_cli_mock.return_value = result
+    wakeup = await provider.send_wakeup()
     assert wakeup.success
     assert "hi there!" in wakeup.message
 
 
-@pytest.mark.asyncio
-async def test_send_wakeup_rate_limited(provider):
+async def test_send_wakeup_rate_limited(provider, run_cli_mock):
     result = CLIResult(
         returncode=0,
-        stdout=json.dumps(
-            {
-                "is_error": True,
-                "result": "Claude usage limit reached. Your limit will reset in 3 hours 42 minutes.",
-            }
-        ),
+        stdout=WAKEUP_RATE_LIMITED_STDOUT,
         stderr="",
     )
-    with patch(
-        "src.providers.claude.run_cli", new_callable=AsyncMock, return_value=result
-    ):
-        wakeup = await provider.send_wakeup()
+    run_cli_mock.return_value = result
+    wakeup = await provider.send_wakeup()
     assert not wakeup.success
     assert wakeup.failure_kind == WakeupFailureKind.RATE_LIMIT
     assert wakeup.rate_limit_reset is not None
     assert "3 hours" in wakeup.rate_limit_reset
 
 
-@pytest.mark.asyncio
-async def test_send_wakeup_auth_error(provider):
-    result = CLIResult(
-        returncode=0,
-        stdout=json.dumps({"is_error": True, "result": "Invalid API key"}),
-        stderr="",
-    )
-    with patch(
-        "src.providers.claude.run_cli", new_callable=AsyncMock, return_value=result
-    ):
-        wakeup = await provider.send_wakeup()
-    assert not wakeup.success
-    assert wakeup.failure_kind == WakeupFailureKind.AUTH
-    assert "Auth error" in wakeup.message
-
-
-@pytest.mark.asyncio
-async def test_send_wakeup_timeout(provider):
-    result = CLIResult(returncode=-1, stdout="", stderr="Timed out after 60s")
-    with patch(
-        "src.providers.claude.run_cli", new_callable=AsyncMock, return_value=result
-    ):
-        wakeup = await provider.send_wakeup()
+SEND_WAKEUP_FAILURE_CASES = [
+    pytest.param(
+        CLIResult(
+            returncode=0,
+            stdout=WAKEUP_INVALID_KEY_STDOUT,
+            stderr="",
+        ),
+        WakeupFailureKind.AUTH,
+        "Auth error",
+        id="auth_error",
+    ),
+    pytest.param(
+        CLIResult(returncode=-1, stdout=b"", stderr="Timed out after 60s"),
+        WakeupFailureKind.TRANSIENT,
+        "timed out",
+        id="timeout",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    ("result", "expected_kind", "message_fragment"), SEND_WAKEUP_FAILURE_CASES
+)
+async def test_send_wakeup_failure(
+    provider, run_cli_mock, result, expected_kind, message_fragment
+):
+    run_cli_mock.return_value = result
+    wakeup = await provider.send_wakeup()
     assert not wakeup.success
-    assert wakeup.failure_kind == WakeupFailureKind.TRANSIENT
-    assert "timed out" in wakeup.message.lower()
+    assert wakeup.failure_kind == expected_kind
+    assert message_fragment in wakeup.message
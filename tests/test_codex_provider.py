@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+from collections.abc import Iterator
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -13,7 +16,40 @@ from src.providers.codex import CodexProvider
 from src.providers.subprocess import CLIResult
 
 
-@pytest.fixture()
+_TOKEN_REUSED_MESSAGE = (
+    "Your access token could not be refreshed because your refresh token was "
+    "already used. Please log out and sign in again."
+)
+
+
+def _jsonl(*events: dict) -> bytes:
+    return "\n".join(json.dumps(event) for event in events).encode()
+
+
+WAKEUP_SUCCESS_STDOUT = _jsonl(
+    {"type": "task.start"},
+    {"type": "task.complete", "message": "done"},
+)
+WAKEUP_AUTH_FAILURE_STDOUT = _jsonl(
+    {"type": "error", "message": _TOKEN_REUSED_MESSAGE},
+    {"type": "turn.failed", "error": {"message": _TOKEN_REUSED_MESSAGE}},
+)
+WAKEUP_RATE_LIMITED_STDOUT = _jsonl(
+    {
+        "type": "error",
+        "message": "You've hit your usage limit. Try again in 3 days 1 hour 58 minutes.",
+    },
+)
+WAKEUP_MIXED_ERRORS_STDOUT = _jsonl(
+    {"type": "thread.started", "thread_id": "t1"},
+    {"type": "error", "message": "Not logged in"},
+    {"type": "error", "message": "You've hit your usage limit."},
+    {"type": "item.completed", "item": {"text": "error"}},
+    {"type": "turn.failed", "error": {"message": ""}},
+)
+
+
+@pytest.fixture(scope="module")
 def provider() -> CodexProvider:
     config = ProviderConfig(
         name="codex",
@@ -26,156 +62,177 @@ def provider() -> CodexProvider:
     return CodexProvider(config)
 
 
-# --- check_auth ---
-
-
-@pytest.mark.asyncio
-async def test_check_auth_success(provider):
-    result = CLIResult(returncode=0, stdout="Logged in using ChatGPT", stderr="")
-    with patch(
-        "src.providers.codex.run_cli", new_callable=AsyncMock, return_value=result
-    ):
-        status = await provider.check_auth()
-    assert status == AuthStatus.OK
+@pytest.fixture(scope="module")
+def run_cli_mock() -> Iterator[AsyncMock]:
+    """Patch ``run_cli`` once for the module; tests set ``return_value``."""
+    mock = AsyncMock()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("src.providers.codex.run_cli", mock)
+        yield mock
 
 
-@pytest.mark.asyncio
-async def test_check_auth_not_logged_in(provider):
-    result = CLIResult(returncode=1, stdout="Not authenticated", stderr="")
-    with patch(
-        "src.providers.codex.run_cli", new_callable=AsyncMock, return_value=result
-    ):
-        status = await provider.check_auth()
-    assert status == AuthStatus.NOT_AUTHENTICATED
+@pytest.fixture(autouse=True)
+def reset_provider(provider: CodexProvider, run_cli_mock: AsyncMock) -> None:
+    """Clear the per-flow state that the module-scoped fixtures carry over."""
+    run_cli_mock.reset_mock(return_value=True)
+    provider._device_auth_proc = None
 
 
-@pytest.mark.asyncio
-async def test_check_auth_not_logged_in_phrase(provider):
-    result = CLIResult(returncode=1, stdout="Not logged in", stderr="")
-    with patch(
-        "src.providers.codex.run_cli", new_callable=AsyncMock, return_value=result
-    ):
-        status = await provider.check_auth()
-    assert status == AuthStatus.NOT_AUTHENTICATED
+# --- check_auth ---
 
 
-@pytest.mark.asyncio
-async def test_check_auth_error(provider):
-    result = CLIResult(returncode=1, stdout="", stderr="something went wrong")
-    with patch(
-        "src.providers.codex.run_cli", new_callable=AsyncMock, return_value=result
-    ):
-        status = await provider.check_auth()
-    assert status == AuthStatus.ERROR
+CHECK_AUTH_CASES = [
+    pytest.param(
+        CLIResult(returncode=0, stdout="Logged in using ChatGPT", stderr=""),
+        AuthStatus.OK,
+        id="success",
+    ),
+    pytest.param(
+        CLIResult(returncode=1, stdout="Not authenticated", stderr=""),
+        AuthStatus.NOT_AUTHENTICATED,
+        id="not_authenticated",
+    ),
+    pytest.param(
+        CLIResult(returncode=1, stdout="Not logged in", stderr=""),
+        AuthStatus.NOT_AUTHENTICATED,
+        id="not_logged_in_phrase",
+    ),
+    pytest.param(
+        CLIResult(returncode=1, stdout="", stderr="something went wrong"),
+        AuthStatus.ERROR,
+        id="error",
+    ),
+]
+
+
+@pytest.mark.parametrize(("result", "expected"), CHECK_AUTH_CASES)
+async def test_check_auth(provider, run_cli_mock, result, expected):
+    run_cli_mock.return_value = result
+    status = await provider.check_auth()
+    assert status == expected
 
 
 # --- send_wakeup ---
 
 
-@pytest.mark.asyncio
-async def test_send_wakeup_success(provider):
-    jsonl = "\n".join(
-        [
-            json.dumps({"type": "task.start"}),
-            json.dumps({"type": "task.complete", "message": "done"}),
-        ]
-    )
-    result = CLIResult(returncode=0, stdout=jsonl, stderr="")
-    with patch(
-        "src.providers.codex.run_cli", new_callable=AsyncMock, return_value=result
-    ) as run_mock:
-        wakeup = await provider.send_wakeup()
+async def test_send_wakeup_success(provider, run_cli_mock):
+    result = CLIResult(returncode=0, stdout=WAKEUP_SUCCESS_STDOUT, stderr="")
+    run_cli_mock.return_value = result
+    wakeup = await provider.send_wakeup()
     assert wakeup.success
-    assert "--skip-git-repo-check" in run_mock.call_args.args
-
-
-@pytest.mark.asyncio
-async def test_send_wakeup_auth_failure(provider):
-    jsonl = "\n".join(
-        [
-            json.dumps(
-                {
-                    "type": "error",
-                    "message": "Your access token could not be refreshed because your refresh token was already used. Please log out and sign in again.",
-                }
-            ),
-            json.dumps(
-                {
-                    "type": "turn.failed",
-                    "error": {
-                        "message": "Your access token could not be refreshed because your refresh token was already used. Please log out and sign in again.",
-                    },
-                }
-            ),
-        ]
-    )
-    result = CLIResult(returncode=1, stdout=jsonl, stderr="")
-    with patch(
-        "src.providers.codex.run_cli", new_callable=AsyncMock, return_value=result
-    ):
-        wakeup = await provider.send_wakeup()
+    assert "--skip-git-repo-check" in run_cli_mock.call_args.args
+
+
+SEND_WAKEUP_FAILURE_CASES = [
+    pytest.param(
+        CLIResult(
+            returncode=1,
+            stdout=WAKEUP_AUTH_FAILURE_STDOUT,
+            stderr="",
+        ),
+        WakeupFailureKind.AUTH,
+        "Auth error",
+        id="auth_failure",
+    ),
+    pytest.param(
+        CLIResult(returncode=-1, stdout=b"", stderr="Timed out after 60s"),
+        WakeupFailureKind.TRANSIENT,
+        "timed out",
+        id="timeout",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    ("result", "expected_kind", "message_fragment"), SEND_WAKEUP_FAILURE_CASES
+)
+async def test_send_wakeup_failure(
+    provider, run_cli_mock, result, expected_kind, message_fragment
+):
+    run_cli_mock.return_value = result
+    wakeup = await provider.send_wakeup()
     assert not wakeup.success
-    assert wakeup.failure_kind == WakeupFailureKind.AUTH
-    assert "Auth error" in wakeup.message
+    assert wakeup.failure_kind == expected_kind
+    assert message_fragment in wakeup.message
 
 
-@pytest.mark.asyncio
-async def test_send_wakeup_rate_limited(provider):
-    jsonl = json.dumps(
-        {
-            "type": "error",
-            "message": "You've hit your usage limit. Try again in 3 days 1 hour 58 minutes.",
-        }
-    )
-    result = CLIResult(returncode=1, stdout=jsonl, stderr="")
-    with patch(
-        "src.providers.codex.run_cli", new_callable=AsyncMock, return_value=result
-    ):
-        wakeup = await provider.send_wakeup()
+async def test_send_wakeup_rate_limited(provider, run_cli_mock):
+    result = CLIResult(returncode=1, stdout=WAKEUP_RATE_LIMITED_STDOUT, stderr="")
+    run_cli_mock.return_value = result
+    wakeup = await provider.send_wakeup()
     assert not wakeup.success
     assert wakeup.failure_kind == WakeupFailureKind.RATE_LIMIT
     assert wakeup.rate_limit_reset is not None
     assert "3 days" in wakeup.rate_limit_reset
 
 
-@pytest.mark.asyncio
-async def test_send_wakeup_timeout(provider):
-    result = CLIResult(returncode=-1, stdout="", stderr="Timed out after 60s")
-    with patch(
-        "src.providers.codex.run_cli", new_callable=AsyncMock, return_value=result
-    ):
-        wakeup = await provider.send_wakeup()
+async def test_send_wakeup_uses_last_error_message(provider, run_cli_mock):
+    result = CLIResult(returncode=1, stdout=WAKEUP_MIXED_ERRORS_STDOUT, stderr="")
+    run_cli_mock.return_value = result
+    wakeup = await provider.send_wakeup()
     assert not wakeup.success
-    assert wakeup.failure_kind == WakeupFailureKind.TRANSIENT
-    assert "timed out" in wakeup.message.lower()
+    assert wakeup.failure_kind == WakeupFailureKind.RATE_LIMIT
+    assert wakeup.message == "You've hit your usage limit."
 
 
 # --- device auth ---
 
 
-@pytest.mark.asyncio
 async def test_start_device_auth_parses_ansi_device_output(provider):
-    output = (
-        "\nWelcome to Codex [v\x1b[90m0.87.0\x1b[0m]\n"
-        "Follow these steps to sign in with ChatGPT using device code authorization:\n"
-        "1. Open this link in your browser\n"
-        "   \x1b[94mhttps://auth.openai.com/codex/device\x1b[0m\n"
-        "2. Enter this one-time code \x1b[90m(expires in 15 minutes)\x1b[0m\n"
-        "   \x1b[94m9HVM-YVL8Y\x1b[0m\n"
+    stream = asyncio.StreamReader()
+    stream.feed_data(
+        b"\nWelcome to Codex [v\x1b[90m0.87.0\x1b[0m]\n"
+        b"Follow these steps to sign in with ChatGPT using device code authorization:\n"
+        b"1. Open this link in your browser\n"
+        b"   \x1b[94mhttps://auth.openai.com/codex/device\x1b[0m\n"
+        b"2. Enter this one-time code \x1b[90m(expires in 15 minutes)\x1b[0m\n"
+        b"   \x1b[94m9HVM-YVL8Y\x1b[0m\n"
     )
 
     with patch(
         "src.providers.codex.start_long_running",
         new_callable=AsyncMock,
-        return_value=object(),
-    ), patch.object(
-        provider,
-        "_read_initial_output",
-        new_callable=AsyncMock,
-        return_value=output,
+        return_value=SimpleNamespace(stdout=stream),
     ):
         info = await provider.start_device_auth()
 
     assert info is not None
     assert info.url == "https://auth.openai.com/codex/device"
     assert info.code == "9HVM-YVL8Y"
+
+
+async def test_read_initial_output_stops_once_code_and_url_seen(provider):
+    loop = asyncio.get_running_loop()
+    stream = asyncio.StreamReader()
+    stream.feed_data(b"Welcome to Codex\n" * 200)
+    stream.feed_data(b"   \x1b[94mhttps://auth.openai.com/codex/device\x1b[0m\n   \x1b[9")
+    # The colour escape in front of the code is split across two reads.
+    loop.call_later(0.05, stream.feed_data, b"4m9HVM-YVL8Y\x1b[0m\n")
+    loop.call_later(0.3, stream.feed_data, b"trailing output that must not be read\n")
+    provider._device_auth_proc = SimpleNamespace(stdout=stream)
+
+    output = await provider._read_initial_output(timeout=1)
+
+    assert output is not None
+    assert output.endswith(b"   9HVM-YVL8Y\n")
+    assert b"\x1b" not in output
+    assert b"trailing" not in output
+
+
+async def test_start_device_auth_waits_for_lines_split_across_reads(provider):
+    loop = asyncio.get_running_loop()
+    stream = asyncio.StreamReader()
+    stream.feed_data(b"Welcome to Codex\n   https://auth")
+    loop.call_later(0.02, stream.feed_data, b".openai.com/codex/device\n   ABCD-EF")
+    loop.call_later(0.04, stream.feed_data, b"GH12\n")
+
+    with patch(
+        "src.providers.codex.start_long_running",
+        new_callable=AsyncMock,
+        return_value=SimpleNamespace(stdout=stream),
+    ):
+        info = await provider.start_device_auth()
+
+    assert info is not None
+    assert info.url == "https://auth.openai.com/codex/device"
+    assert info.code == "ABCD-EFGH12"
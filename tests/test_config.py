@@ -3,29 +3,51 @@
 from __future__ import annotations
 
 import os
+from datetime import timedelta
 from unittest.mock import patch
 
 import pytest
 
-from src.config import AppConfig, ResetMode, load_config
+from src.config import (
+    AppConfig,
+    ResetMode,
+    invalidate_config_cache,
+    load_config,
+    load_config_cached,
+)
+
+# Every variable load_config reads starts with one of these.
+_CONFIG_ENV_PREFIXES = ("TELEGRAM_", "SCHEDULER_", "ENABLED_PROVIDERS", "CLAUDE_", "CODEX_")
+
+_BASE_ENV = {
+    "TELEGRAM_BOT_TOKEN": "test-token",
+    "TELEGRAM_CHAT_ID": "12345",
+    "ENABLED_PROVIDERS": "claude,codex",
+}
+
+
+@pytest.fixture()
+def _clean_env(monkeypatch: pytest.MonkeyPatch) -> pytest.MonkeyPatch:
+    """Unset every config variable so only the test's own values apply."""
+    for key in list(os.environ):
+        if key.startswith(_CONFIG_ENV_PREFIXES):
+            monkeypatch.delenv(key)
+    return monkeypatch
 
 
 @pytest.fixture()
-def _env_vars():
+def _env_vars(_clean_env: pytest.MonkeyPatch) -> None:
     """Provide minimal valid environment variables."""
-    env = {
-        "TELEGRAM_BOT_TOKEN": "test-token",
-        "TELEGRAM_CHAT_ID": "12345",
-        "ENABLED_PROVIDERS": "claude,codex",
-    }
-    with patch.dict(os.environ, env, clear=False):
-        yield
+    for key, value in _BASE_ENV.items():
+        _clean_env.setenv(key, value)
 
 
 def test_load_config_with_defaults(_env_vars):
     config = load_config()
     assert config.telegram.bot_token == "test-token"
     assert config.telegram.chat_id == "12345"
+    assert config.telegram.poll_timeout == 30
+    assert config.telegram.poll_limit == 100
     assert config.scheduler.state_path == "data/scheduler_state.json"
     assert config.scheduler.retry_base_seconds == 60
     assert config.scheduler.retry_max_seconds == 3600
@@ -41,69 +63,78 @@ def test_load_config_with_defaults(_env_vars):
     assert config.providers["codex"].weekly_window_seconds == 604800
     assert config.providers["claude"].weekly_wake_delay_seconds == 10
     assert config.providers["codex"].weekly_wake_delay_seconds == 10
+    assert config.providers["codex"].rolling_interval == timedelta(seconds=18010)
+    assert config.providers["codex"].weekly_interval == timedelta(seconds=604810)
 
 
-def test_load_config_custom_model(_env_vars):
-    with patch.dict(os.environ, {"CLAUDE_MODEL": "custom-model"}):
-        config = load_config()
+def test_load_config_custom_model(_env_vars, monkeypatch):
+    monkeypatch.setenv("CLAUDE_MODEL", "custom-model")
+    config = load_config()
     assert config.providers["claude"].model == "custom-model"
 
 
-def test_load_config_invalid_reset_mode(_env_vars):
-    with patch.dict(os.environ, {"CLAUDE_RESET_MODE": "weird"}):
-        with pytest.raises(RuntimeError, match="CLAUDE_RESET_MODE"):
-            load_config()
+def test_load_config_invalid_reset_mode(_env_vars, monkeypatch):
+    monkeypatch.setenv("CLAUDE_RESET_MODE", "weird")
+    with pytest.raises(RuntimeError, match="CLAUDE_RESET_MODE"):
+        load_config()
 
 
-def test_load_config_scheduler_retry_bounds(_env_vars):
-    with patch.dict(
-        os.environ,
-        {
-            "SCHEDULER_RETRY_BASE_SECONDS": "120",
-            "SCHEDULER_RETRY_MAX_SECONDS": "60",
-        },
-    ):
-        with pytest.raises(RuntimeError, match="SCHEDULER_RETRY_MAX_SECONDS"):
-            load_config()
+def test_load_config_scheduler_retry_bounds(_env_vars, monkeypatch):
+    monkeypatch.setenv("SCHEDULER_RETRY_BASE_SECONDS", "120")
+    monkeypatch.setenv("SCHEDULER_RETRY_MAX_SECONDS", "60")
+    with pytest.raises(RuntimeError, match="SCHEDULER_RETRY_MAX_SECONDS"):
+        load_config()
 
 
-def test_load_config_missing_telegram_token():
-    with patch.dict(os.environ, {"TELEGRAM_CHAT_ID": "12345"}, clear=True):
-        with pytest.raises(RuntimeError, match="TELEGRAM_BOT_TOKEN"):
-            load_config()
+def test_load_config_missing_telegram_token(_clean_env):
+    _clean_env.setenv("TELEGRAM_CHAT_ID", "12345")
+    with pytest.raises(RuntimeError, match="TELEGRAM_BOT_TOKEN"):
+        load_config()
 
 
-def test_load_config_single_provider():
-    env = {
-        "TELEGRAM_BOT_TOKEN": "tok",
-        "TELEGRAM_CHAT_ID": "123",
-        "ENABLED_PROVIDERS": "claude",
-    }
-    with patch.dict(os.environ, env, clear=True):
-        config = load_config()
+def test_load_config_single_provider(_clean_env):
+    _clean_env.setenv("TELEGRAM_BOT_TOKEN", "tok")
+    _clean_env.setenv("TELEGRAM_CHAT_ID", "123")
+    _clean_env.setenv("ENABLED_PROVIDERS", "claude")
+    config = load_config()
     assert list(config.providers.keys()) == ["claude"]
 
 
-def test_load_config_maps_legacy_claude_token_name():
-    env = {
-        "TELEGRAM_BOT_TOKEN": "tok",
-        "TELEGRAM_CHAT_ID": "123",
-        "ENABLED_PROVIDERS": "claude",
-        "CLAUDE_AUTH_TOKEN": "legacy-token",
-    }
-    with patch.dict(os.environ, env, clear=True):
+def test_load_config_maps_legacy_claude_token_name(_clean_env):
+    _clean_env.setenv("TELEGRAM_BOT_TOKEN", "tok")
+    _clean_env.setenv("TELEGRAM_CHAT_ID", "123")
+    _clean_env.setenv("ENABLED_PROVIDERS", "claude")
+    _clean_env.setenv("CLAUDE_AUTH_TOKEN", "legacy-token")
+    # load_config() writes the alias into os.environ itself, which monkeypatch
+    # does not track, so snapshot and restore around the call.
+    with patch.dict(os.environ):
         load_config()
         assert os.environ["CLAUDE_CODE_OAUTH_TOKEN"] == "legacy-token"
 
 
-def test_load_config_prefers_new_claude_token_name():
-    env = {
-        "TELEGRAM_BOT_TOKEN": "tok",
-        "TELEGRAM_CHAT_ID": "123",
-        "ENABLED_PROVIDERS": "claude",
-        "CLAUDE_AUTH_TOKEN": "legacy-token",
-        "CLAUDE_CODE_OAUTH_TOKEN": "new-token",
-    }
-    with patch.dict(os.environ, env, clear=True):
-        load_config()
-        assert os.environ["CLAUDE_CODE_OAUTH_TOKEN"] == "new-token"
+def test_load_config_prefers_new_claude_token_name(_clean_env):
+    _clean_env.setenv("TELEGRAM_BOT_TOKEN", "tok")
+    _clean_env.setenv("TELEGRAM_CHAT_ID", "123")
+    _clean_env.setenv("ENABLED_PROVIDERS", "claude")
+    _clean_env.setenv("CLAUDE_AUTH_TOKEN", "legacy-token")
+    _clean_env.setenv("CLAUDE_CODE_OAUTH_TOKEN", "new-token")
+    load_config()
+    assert os.environ["CLAUDE_CODE_OAUTH_TOKEN"] == "new-token"
+
+
+def test_load_config_cached_reloads_after_invalidate(_env_vars, monkeypatch):
+    invalidate_config_cache()
+    try:
+        first = load_config_cached()
+        monkeypatch.setenv("CLAUDE_MODEL", "custom-model")
+        assert load_config_cached() is first
+        invalidate_config_cache()
+        assert load_config_cached().providers["claude"].model == "custom-model"
+    finally:
+        invalidate_config_cache()
+
+
+def test_load_config_providers_are_read_only(_env_vars):
+    config = load_config()
+    with pytest.raises(TypeError):
+        config.providers["claude"] = config.providers["codex"]  # type: ignore[index]
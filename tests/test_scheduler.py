@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import asyncio
+import json
 from collections import deque
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Callable
 
 import pytest
 
@@ -22,6 +24,7 @@ from src.scheduler import (
     WakeupScheduler,
     compute_next_run,
     compute_next_weekly_run,
+    format_time,
     parse_duration_seconds,
 )
 
@@ -67,6 +70,28 @@ class FakeProvider:
         return None
 
 
+class CallbackRecorder:
+    """Records the scheduler's notify and request_auth callbacks."""
+
+    def __init__(self) -> None:
+        self.notifications: list[str] = []
+        self.auth_requests: list[str] = []
+
+    async def notify(self, text: str) -> None:
+        self.notifications.append(text)
+
+    async def request_auth(self, provider_name: str) -> None:
+        self.auth_requests.append(provider_name)
+
+
+@pytest.fixture()
+def callbacks() -> CallbackRecorder:
+    return CallbackRecorder()
+
+
+_TELEGRAM_CFG = TelegramConfig(bot_token="12345:test", chat_id="1")
+
+
 def _build_app_config(
     state_path: Path,
     provider_config: ProviderConfig,
@@ -76,7 +101,7 @@ def _build_app_config(
     retry_max_seconds: int = 8,
 ) -> AppConfig:
     return AppConfig(
-        telegram=TelegramConfig(bot_token="12345:test", chat_id="1"),
+        telegram=_TELEGRAM_CFG,
         scheduler=SchedulerConfig(
             state_path=str(state_path),
             auth_recheck_seconds=auth_recheck_seconds,
@@ -152,10 +177,39 @@ def test_parse_duration_seconds() -> None:
         3 * 24 * 60 * 60 + 1 * 60 * 60 + 58 * 60
     )
     assert parse_duration_seconds("no duration present") is None
+    assert parse_duration_seconds("Reset in 2HOURS 30 Seconds") == 2 * 60 * 60 + 30
+
+
+def test_format_time_renders_utc() -> None:
+    local = timezone(timedelta(hours=2))
+    assert format_time(datetime(2026, 2, 11, 12, 0, 59, 999999, tzinfo=local)) == (
+        "2026-02-11 10:00:59Z"
+    )
+    assert format_time(None) == "-"
+
+
+def test_provider_state_copy_preserves_every_field() -> None:
+    base = datetime(2026, 2, 10, 10, 0, tzinfo=timezone.utc)
+    state = ProviderScheduleState(
+        next_run_at=base,
+        weekly_next_run_at=base + timedelta(days=7),
+        last_success_at=base - timedelta(hours=1),
+        last_attempt_at=base - timedelta(minutes=1),
+        consecutive_failures=3,
+        paused_reason="auth_required",
+        backoff_until=base + timedelta(minutes=5),
+        auth_request_sent=True,
+    )
+
+    copied = state.copy()
 
+    assert copied == state
+    assert copied is not state
 
-@pytest.mark.asyncio
-async def test_transient_failure_exponential_backoff(tmp_path: Path) -> None:
+
+async def test_transient_failure_exponential_backoff(
+    tmp_path: Path, callbacks: CallbackRecorder
+) -> None:
     provider_cfg = _rolling_provider_config(wake_delay_seconds=3600)
     config = _build_app_config(tmp_path / "state.json", provider_cfg)
 
@@ -175,14 +229,11 @@ async def test_transient_failure_exponential_backoff(tmp_path: Path) -> None:
         ],
     )
 
-    notifications: list[str] = []
-    auth_requests: list[str] = []
-
     scheduler = WakeupScheduler(
         config=config,
         providers={"codex": provider},
-        notify=lambda text: _append_async(notifications, text),
-        request_auth=lambda name: _append_async(auth_requests, name),
+        notify=callbacks.notify,
+        request_auth=callbacks.request_auth,
     )
 
     await scheduler.start()
@@ -204,13 +255,14 @@ async def test_transient_failure_exponential_backoff(tmp_path: Path) -> None:
         delta2 = (state2.next_run_at - state2.last_attempt_at).total_seconds()
         assert 1.5 <= delta2 <= 2.5
 
-        assert auth_requests == []
+        assert callbacks.auth_requests == []
     finally:
         await scheduler.stop()
 
 
-@pytest.mark.asyncio
-async def test_auth_failure_triggers_single_auto_auth_request(tmp_path: Path) -> None:
+async def test_auth_failure_triggers_single_auto_auth_request(
+    tmp_path: Path, callbacks: CallbackRecorder
+) -> None:
     provider_cfg = _rolling_provider_config(wake_delay_seconds=0)
     config = _build_app_config(tmp_path / "state.json", provider_cfg)
 
@@ -231,14 +283,11 @@ async def test_auth_failure_triggers_single_auto_auth_request(tmp_path: Path) ->
         ],
     )
 
-    notifications: list[str] = []
-    auth_requests: list[str] = []
-
     scheduler = WakeupScheduler(
         config=config,
         providers={"codex": provider},
-        notify=lambda text: _append_async(notifications, text),
-        request_auth=lambda name: _append_async(auth_requests, name),
+        notify=callbacks.notify,
+        request_auth=callbacks.request_auth,
     )
 
     await scheduler.start()
@@ -248,14 +297,14 @@ async def test_auth_failure_triggers_single_auto_auth_request(tmp_path: Path) ->
         assert state1 is not None
         assert state1.paused_reason == "auth_required"
         assert state1.auth_request_sent
-        assert auth_requests == ["codex"]
+        assert callbacks.auth_requests == ["codex"]
 
         await scheduler.trigger_wakeup("codex")
         state2 = scheduler.get_state("codex")
         assert state2 is not None
         assert state2.auth_request_sent
         # No repeated automatic /auth triggers.
-        assert auth_requests == ["codex"]
+        assert callbacks.auth_requests == ["codex"]
 
         await scheduler.trigger_wakeup("codex")
         state3 = scheduler.get_state("codex")
@@ -267,21 +316,67 @@ async def test_auth_failure_triggers_single_auto_auth_request(tmp_path: Path) ->
         await scheduler.stop()
 
 
-@pytest.mark.asyncio
-async def test_recover_overdue_provider_from_persisted_state(tmp_path: Path) -> None:
+async def test_slow_auth_request_does_not_block_wakeup(
+    tmp_path: Path, callbacks: CallbackRecorder
+) -> None:
+    provider_cfg = _rolling_provider_config(wake_delay_seconds=3600)
+    config = _build_app_config(tmp_path / "state.json", provider_cfg)
+    provider = FakeProvider(
+        "Codex",
+        wakeup_results=[
+            WakeupResult(
+                success=False,
+                message="expired token",
+                failure_kind=WakeupFailureKind.AUTH,
+            )
+        ],
+    )
+    auth_started = asyncio.Event()
+    release_auth = asyncio.Event()
+
+    async def slow_request_auth(name: str) -> None:
+        auth_started.set()
+        await release_auth.wait()
+
+    scheduler = WakeupScheduler(
+        config=config,
+        providers={"codex": provider},
+        notify=callbacks.notify,
+        request_auth=slow_request_auth,
+    )
+
+    await scheduler.start()
+    try:
+        result = await asyncio.wait_for(scheduler.trigger_wakeup("codex"), timeout=1)
+        assert result is not None
+        assert result.failure_kind == WakeupFailureKind.AUTH
+        await asyncio.wait_for(auth_started.wait(), timeout=1)
+    finally:
+        # stop() cancels the auth flow that is still waiting.
+        await asyncio.wait_for(scheduler.stop(), timeout=1)
+
+
+async def test_recover_overdue_provider_from_persisted_state(
+    tmp_path: Path, callbacks: CallbackRecorder
+) -> None:
     state_path = tmp_path / "scheduler_state.json"
     now = datetime.now(timezone.utc)
 
     # Persist a stale schedule in the past to force immediate wake-up.
-    state_path.write_text(
-        (
-            '{"schema_version":1,"providers":{"codex":'
-            f'{{"next_run_at":"{(now - timedelta(seconds=5)).isoformat()}",' 
-            '"last_success_at":null,"last_attempt_at":null,'
-            '"consecutive_failures":0,"paused_reason":null,"backoff_until":null}}}'
-        ),
-        encoding="utf-8",
-    )
+    state_data = {
+        "schema_version": 1,
+        "providers": {
+            "codex": {
+                "next_run_at": (now - timedelta(seconds=5)).isoformat(),
+                "last_success_at": None,
+                "last_attempt_at": None,
+                "consecutive_failures": 0,
+                "paused_reason": None,
+                "backoff_until": None,
+            }
+        },
+    }
+    state_path.write_text(json.dumps(state_data), encoding="utf-8")
 
     provider_cfg = _rolling_provider_config(wake_delay_seconds=3600)
     config = _build_app_config(state_path, provider_cfg)
@@ -290,13 +385,13 @@ async def test_recover_overdue_provider_from_persisted_state(tmp_path: Path) ->
     scheduler = WakeupScheduler(
         config=config,
         providers={"codex": provider},
-        notify=lambda text: _append_async([], text),
-        request_auth=lambda name: _append_async([], name),
+        notify=callbacks.notify,
+        request_auth=callbacks.request_auth,
     )
 
     await scheduler.start()
     try:
-        await asyncio.sleep(0.2)
+        await _wait_until(lambda: scheduler.get_state("codex").last_success_at is not None)
         state = scheduler.get_state("codex")
         assert state is not None
         assert provider.send_calls >= 1
@@ -306,8 +401,77 @@ async def test_recover_overdue_provider_from_persisted_state(tmp_path: Path) ->
         await scheduler.stop()
 
 
-@pytest.mark.asyncio
-async def test_corrupt_state_file_falls_back_to_defaults(tmp_path: Path) -> None:
+async def test_load_epoch_timestamps_from_persisted_state(
+    tmp_path: Path, callbacks: CallbackRecorder
+) -> None:
+    state_path = tmp_path / "scheduler_state.json"
+    next_run_at = datetime(2099, 1, 1, 12, 0, tzinfo=timezone.utc)
+    weekly_next_run_at = datetime(2099, 1, 5, 12, 0, tzinfo=timezone.utc)
+    state_path.write_text(
+        json.dumps(
+            {
+                "schema_version": 2,
+                "providers": {
+                    "codex": {
+                        "next_run_at": int(next_run_at.timestamp()),
+                        "weekly_next_run_at": int(weekly_next_run_at.timestamp()),
+                        "last_success_at": None,
+                        "consecutive_failures": 1,
+                    }
+                },
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    config = _build_app_config(state_path, _rolling_provider_config())
+    scheduler = WakeupScheduler(
+        config=config,
+        providers={"codex": FakeProvider("Codex")},
+        notify=callbacks.notify,
+        request_auth=callbacks.request_auth,
+    )
+
+    await scheduler.start()
+    try:
+        state = scheduler.get_state("codex")
+        assert state is not None
+        assert state.next_run_at == next_run_at
+        assert state.weekly_next_run_at == weekly_next_run_at
+        assert state.consecutive_failures == 1
+    finally:
+        await scheduler.stop()
+
+
+async def test_unchanged_state_is_not_rewritten(
+    tmp_path: Path, callbacks: CallbackRecorder
+) -> None:
+    state_path = tmp_path / "scheduler_state.json"
+    config = _build_app_config(state_path, _rolling_provider_config(wake_delay_seconds=3600))
+
+    def build() -> WakeupScheduler:
+        return WakeupScheduler(
+            config=config,
+            providers={"codex": FakeProvider("Codex")},
+            notify=callbacks.notify,
+            request_auth=callbacks.request_auth,
+        )
+
+    first = build()
+    await first.start()
+    await first.stop()
+    written_at = state_path.stat().st_mtime_ns
+
+    second = build()
+    await second.start()
+    await second.stop()
+
+    assert state_path.stat().st_mtime_ns == written_at
+
+
+async def test_corrupt_state_file_falls_back_to_defaults(
+    tmp_path: Path, callbacks: CallbackRecorder
+) -> None:
     state_path = tmp_path / "scheduler_state.json"
     state_path.write_text("not-json", encoding="utf-8")
 
@@ -318,8 +482,8 @@ async def test_corrupt_state_file_falls_back_to_defaults(tmp_path: Path) -> None
     scheduler = WakeupScheduler(
         config=config,
         providers={"codex": provider},
-        notify=lambda text: _append_async([], text),
-        request_auth=lambda name: _append_async([], name),
+        notify=callbacks.notify,
+        request_auth=callbacks.request_auth,
     )
 
     await scheduler.start()
@@ -331,16 +495,17 @@ async def test_corrupt_state_file_falls_back_to_defaults(tmp_path: Path) -> None
         await scheduler.stop()
 
 
-@pytest.mark.asyncio
-async def test_schedule_next_wakeup_sets_only_5h_timer(tmp_path: Path) -> None:
+async def test_schedule_next_wakeup_sets_only_5h_timer(
+    tmp_path: Path, callbacks: CallbackRecorder
+) -> None:
     provider_cfg = _rolling_provider_config(wake_delay_seconds=10)
     config = _build_app_config(tmp_path / "state.json", provider_cfg)
     provider = FakeProvider("Codex")
     scheduler = WakeupScheduler(
         config=config,
         providers={"codex": provider},
-        notify=lambda text: _append_async([], text),
-        request_auth=lambda name: _append_async([], name),
+        notify=callbacks.notify,
+        request_auth=callbacks.request_auth,
     )
 
     await scheduler.start()
@@ -357,5 +522,125 @@ async def test_schedule_next_wakeup_sets_only_5h_timer(tmp_path: Path) -> None:
         await scheduler.stop()
 
 
-async def _append_async(target: list[str], value: str) -> None:
-    target.append(value)
+async def test_state_writes_are_coalesced_and_flushed_on_stop(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, callbacks: CallbackRecorder
+) -> None:
+    monkeypatch.setattr("src.scheduler._PERSIST_DEBOUNCE_SECONDS", 0.05)
+    state_path = tmp_path / "state.json"
+    provider_cfg = _rolling_provider_config(wake_delay_seconds=10)
+    config = _build_app_config(state_path, provider_cfg)
+    scheduler = WakeupScheduler(
+        config=config,
+        providers={"codex": FakeProvider("Codex")},
+        notify=callbacks.notify,
+        request_auth=callbacks.request_auth,
+    )
+
+    await scheduler.start()
+    writes = 0
+    persist_state = scheduler._persist_state
+
+    async def counting_persist() -> None:
+        nonlocal writes
+        writes += 1
+        await persist_state()
+
+    scheduler._persist_state = counting_persist
+    try:
+        base = datetime(2099, 2, 11, 12, 0, tzinfo=timezone.utc)
+        for hours in range(3):
+            await scheduler.schedule_next_wakeup("codex", base + timedelta(hours=hours))
+        await _wait_until(lambda: writes == 1)
+        await asyncio.sleep(0.1)
+        assert writes == 1
+
+        target = base + timedelta(days=1)
+        await scheduler.schedule_next_wakeup("codex", target)
+        await _wait_until(lambda: writes == 2)
+
+        # Re-applying the same schedule changes nothing, so nothing is written.
+        await scheduler.schedule_next_wakeup("codex", target)
+        await asyncio.sleep(0.1)
+        assert writes == 2
+    finally:
+        await scheduler.stop()
+
+    assert writes == 3
+    payload = json.loads(state_path.read_text(encoding="utf-8"))
+    assert payload["schema_version"] == 2
+    assert payload["providers"]["codex"]["next_run_at"] == int(target.timestamp())
+
+
+def test_stale_state_write_does_not_overwrite_newer(
+    tmp_path: Path, callbacks: CallbackRecorder
+) -> None:
+    state_path = tmp_path / "state.json"
+    config = _build_app_config(state_path, _rolling_provider_config())
+    scheduler = WakeupScheduler(
+        config=config,
+        providers={"codex": FakeProvider("Codex")},
+        notify=callbacks.notify,
+        request_auth=callbacks.request_auth,
+    )
+
+    # A cancelled persist's thread finishing after stop()'s final flush.
+    scheduler._write_state_file({"schema_version": 2, "providers": {"new": {}}}, 2)
+    scheduler._write_state_file({"schema_version": 2, "providers": {"old": {}}}, 1)
+
+    payload = json.loads(state_path.read_text(encoding="utf-8"))
+    assert payload["providers"] == {"new": {}}
+
+
+async def test_stop_wakes_pending_sleepers(tmp_path: Path, callbacks: CallbackRecorder) -> None:
+    provider_cfg = _rolling_provider_config(wake_delay_seconds=3600)
+    config = _build_app_config(tmp_path / "state.json", provider_cfg)
+    scheduler = WakeupScheduler(
+        config=config,
+        providers={"codex": FakeProvider("Codex")},
+        notify=callbacks.notify,
+        request_auth=callbacks.request_auth,
+    )
+
+    await scheduler.start()
+    sleeper = asyncio.create_task(scheduler._sleep_or_stop(3600))
+    await asyncio.sleep(0)
+    await scheduler.stop()
+
+    await asyncio.wait_for(sleeper, timeout=1)
+
+
+def test_format_status_renders_provider_blocks_in_name_order(
+    tmp_path: Path, callbacks: CallbackRecorder
+) -> None:
+    config = _build_app_config(tmp_path / "state.json", _rolling_provider_config())
+    scheduler = WakeupScheduler(
+        config=config,
+        providers={"codex": FakeProvider("Codex"), "claude": FakeProvider("Claude")},
+        notify=callbacks.notify,
+        request_auth=callbacks.request_auth,
+    )
+    scheduler._states["codex"] = ProviderScheduleState(
+        next_run_at=datetime(2026, 2, 11, 12, 0, tzinfo=timezone.utc),
+        last_success_at=datetime(2026, 2, 11, 7, 0, tzinfo=timezone.utc),
+        paused_reason="auth_required",
+        consecutive_failures=2,
+    )
+
+    status = scheduler.format_status()
+
+    assert status.index("<b>claude:</b> not initialized") < status.index("CODEX")
+    assert (
+        "<b>┌─ CODEX</b> [🔐 auth required]\n"
+        "│  <b>Next 5h:</b> 2026-02-11 14:00:00\n"
+        "│  <b>Next 7d:</b> -\n"
+        "│  <b>Last OK:</b> 2026-02-11 09:00:00\n"
+        "│  <b>Failures:</b> 2\n"
+        "└─────────────────\n"
+    ) in status
+
+
+async def _wait_until(predicate: Callable[[], bool], timeout: float = 2.0) -> None:
+    """Yield to the loop until ``predicate`` holds instead of sleeping a fixed time."""
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.001)